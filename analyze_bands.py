@@ -0,0 +1,70 @@
+import os
+import csv
+import argparse
+from glob import glob
+
+from audio_tools.bands import corpus_band_levels, power_mean_db
+from audio_tools.words import list_word_files
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+AUDIO_DIR = os.path.join(BASE_DIR, "audio")
+
+SPEECH_LISTS = ["HF1", "HF2", "HF3", "HF4", "1A", "2A", "3A", "4A"]
+NOISE_GLOBS = ["noise/*.wav", "calibration/*MasterNoise.wav", "Rose_Hill_Noise.wav"]
+
+def collect_groups(audio_dir):
+    """{label: [wav paths]}: one group per speech list, one per noise master."""
+    groups = {}
+    for name in SPEECH_LISTS:
+        files = list_word_files(os.path.join(audio_dir, name))
+        if files:
+            groups[name] = files
+    for pattern in NOISE_GLOBS:
+        for path in sorted(glob(os.path.join(audio_dir, pattern))):
+            groups[os.path.splitext(os.path.basename(path))[0]] = [path]
+    return groups
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Third-octave (or octave) band levels of the speech lists and noise masters.")
+    parser.add_argument("--octave", action="store_true", help="Octave bands instead of third-octave bands")
+    parser.add_argument("--csv", help="Also write the table to this CSV file")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: one per core)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    fraction = 1 if args.octave else 3
+    groups = collect_groups(AUDIO_DIR)
+    if not groups:
+        print(f"No audio found under {AUDIO_DIR}")
+        return
+
+    # One corpus pass over every file; groups are sliced out afterwards
+    all_paths = [p for paths in groups.values() for p in paths]
+    result = corpus_band_levels(all_paths, fraction=fraction, n_jobs=args.jobs)
+    row_of = {p: i for i, p in enumerate(result["paths"])}
+    centers = result["centers"]
+
+    table = []
+    for label, paths in groups.items():
+        rows = [row_of[p] for p in paths if p in row_of]
+        if not rows:
+            continue
+        table.append((label, len(rows), power_mean_db(result["per_file"][rows])))
+
+    header = f"{'Group':<26}{'Files':>6}" + "".join(f"{c:>8}" for c in centers)
+    print(header)
+    print("-" * len(header))
+    for label, n, levels in table:
+        print(f"{label:<26}{n:>6}" + "".join(f"{v:8.1f}" for v in levels))
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["group", "files"] + [f"{c} Hz" for c in centers])
+            for label, n, levels in table:
+                writer.writerow([label, n] + [round(float(v), 2) for v in levels])
+        print(f"\nTable written to {args.csv}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+"""
+Shared helpers for the audio asset scripts (prepare_assets.py,
+generate_all_noise.py, scripts/*.py).
+"""
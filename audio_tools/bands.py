@@ -0,0 +1,233 @@
+import functools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import scipy.signal as signal
+
+from audio_tools.noise import FRAME_SIZE, analysis_window, accumulate_power_spectrum
+from audio_tools.psd import sample_rate
+from audio_tools.wavio import read_wav
+
+# Files handed to each worker per task
+BATCH_SIZE = 16
+
+# Signals whose lengths are within this ratio of each other are zero-padded
+# into one 2-D block and filtered together, so padding adds at most 25%
+LENGTH_BUCKET_RATIO = 1.25
+
+# Butterworth prototype order of each band-pass (a 6th-order band-pass)
+FILTER_ORDER = 3
+
+# Nominal third-octave centres (IEC 61260 / ANSI S1.11), 100 Hz - 16 kHz
+THIRD_OCTAVE_CENTERS = [
+    100, 125, 160, 200, 250, 315, 400, 500, 630, 800, 1000, 1250,
+    1600, 2000, 2500, 3150, 4000, 5000, 6300, 8000, 10000, 12500, 16000,
+]
+OCTAVE_CENTERS = [125, 250, 500, 1000, 2000, 4000, 8000, 16000]
+
+def exact_centers(nominal, fraction=3):
+    """Base-10 exact mid-band frequencies for the nominal centres."""
+    step = 10 ** (0.3 / fraction)
+    return np.array([1000.0 * step ** round(np.log(f / 1000.0) / np.log(step)) for f in nominal])
+
+def band_edges(nominal, fraction=3):
+    """(lower, upper) edge frequencies, each of shape (n_bands,)."""
+    centers = exact_centers(nominal, fraction)
+    half = 10 ** (0.15 / fraction)
+    return centers / half, centers * half
+
+def bands_below(nominal, sr, fraction=3):
+    """The nominal centres whose upper edge is below Nyquist."""
+    _, upper = band_edges(nominal, fraction)
+    return [f for f, hi in zip(nominal, upper) if hi < sr / 2]
+
+def spectrum_band_power(power, freqs, nominal, fraction=3):
+    """
+    Sums a one-sided power spectrum (power per bin, already scaled so the
+    bins add up to the signal's mean square) into bands. A bin belongs to
+    the band whose edges contain its frequency.
+    """
+    lower, upper = band_edges(nominal, fraction)
+    cum = np.concatenate(([0.0], np.cumsum(power)))
+    lo = np.searchsorted(freqs, lower)
+    hi = np.searchsorted(freqs, upper)
+    return cum[hi] - cum[lo]
+
+def psd_band_levels(freqs, psd, nominal, fraction=3):
+    """Band levels (dB) from a one-sided PSD density such as Welch's."""
+    power = spectrum_band_power(psd * (freqs[1] - freqs[0]), freqs, nominal, fraction)
+    with np.errstate(divide="ignore"):
+        return 10 * np.log10(power)
+
+def power_sum_to_bins(power_sum, n_frames, frame_size=FRAME_SIZE):
+    """
+    Scales summed |rfft|^2 of Hann-windowed frames (see
+    noise.accumulate_power_spectrum) to mean square per bin (Parseval),
+    so that the bins add up to the average frame power.
+    """
+    window = analysis_window(frame_size).astype(np.float64)
+    scale = np.full(len(power_sum), 2.0)
+    scale[0] = 1.0
+    if frame_size % 2 == 0:
+        scale[-1] = 1.0
+    return power_sum * scale / (n_frames * frame_size * np.dot(window, window))
+
+class LtassAccumulator:
+    """
+    Long-term average speech spectrum over many files, one file at a time.
+    Keeps only running totals (sum of squares, sample count, summed frame
+    power spectrum and per-file power/duration), never the samples, so
+    memory does not grow with the corpus.
+    """
+
+    def __init__(self, sr, frame_size=FRAME_SIZE):
+        self.sr = sr
+        self.frame_size = frame_size
+        self.sum_sq = 0.0
+        self.n_samples = 0
+        self.power_sum = np.zeros(frame_size // 2 + 1)
+        self.n_frames = 0
+        self.files = []  # (mean square, duration) per file
+
+    def add(self, data, sr):
+        if sr != self.sr:
+            raise ValueError(f"sample rate {sr} Hz, LTASS is at {self.sr} Hz")
+        sum_sq = float(np.einsum('i,i->', data, data, dtype=np.float64))
+        self.sum_sq += sum_sq
+        self.n_samples += len(data)
+        self.files.append((sum_sq / len(data) if len(data) else 0.0, len(data) / sr))
+        if len(data):
+            power, frames = accumulate_power_spectrum(data, self.frame_size)
+            self.power_sum += power
+            self.n_frames += frames
+
+    def level_db(self):
+        """RMS of all samples, as if the files were concatenated."""
+        return 10 * np.log10(self.sum_sq / self.n_samples)
+
+    def duration_weighted_db(self):
+        """Per-file mean power weighted by duration."""
+        ms, dur = np.array(self.files).T
+        return 10 * np.log10(np.sum(ms * dur) / np.sum(dur))
+
+    def file_average_db(self):
+        """Per-file mean power, every file weighted equally."""
+        return 10 * np.log10(np.mean([ms for ms, _ in self.files]))
+
+    def band_levels(self, nominal=THIRD_OCTAVE_CENTERS, fraction=3):
+        """{nominal centre: level in dBFS} of the LTASS, for bands below Nyquist."""
+        nominal = bands_below(nominal, self.sr, fraction)
+        bins = power_sum_to_bins(self.power_sum, self.n_frames, self.frame_size)
+        freqs = np.fft.rfftfreq(self.frame_size, 1.0 / self.sr)
+        power = spectrum_band_power(bins, freqs, nominal, fraction)
+        with np.errstate(divide="ignore"):
+            return dict(zip(nominal, 10 * np.log10(power)))
+
+def power_mean_db(levels_db, axis=0):
+    """Energy (power) mean of dB levels, in dB."""
+    return 10 * np.log10(np.mean(10 ** (np.asarray(levels_db) / 10), axis=axis))
+
+def default_centers(fraction):
+    return OCTAVE_CENTERS if fraction == 1 else THIRD_OCTAVE_CENTERS
+
+@functools.lru_cache(maxsize=None)
+def filterbank(sr, fraction=3, nominal=None, order=FILTER_ORDER):
+    """
+    Butterworth band-pass SOS for every band below Nyquist, designed once
+    per (sample rate, band set) and cached for the life of the process.
+    `nominal` must be a tuple (hashable) or None for the standard set.
+    Returns (nominal centres, sos of shape (n_bands, n_sections, 6)).
+    """
+    nominal = bands_below(list(nominal or default_centers(fraction)), sr, fraction)
+    lower, upper = band_edges(nominal, fraction)
+    sos = np.stack([
+        signal.butter(order, [lo, hi], btype='bandpass', fs=sr, output='sos')
+        for lo, hi in zip(lower, upper)
+    ])
+    return nominal, sos
+
+def length_buckets(lengths, ratio=LENGTH_BUCKET_RATIO):
+    """
+    Indices into `lengths`, grouped (shortest first) so that the longest
+    in each group is at most `ratio` times the shortest.
+    """
+    buckets = []
+    for i in np.argsort(lengths, kind="stable"):
+        if buckets and lengths[i] <= ratio * lengths[buckets[-1][0]]:
+            buckets[-1].append(i)
+        else:
+            buckets.append([i])
+    return buckets
+
+def band_levels(signals, sr, fraction=3, nominal=None):
+    """
+    Band levels in dBFS of several signals at one sample rate. Signals of
+    similar length (see length_buckets) are zero-padded into a 2-D block
+    and each band filter runs over the block in a single sosfilt call;
+    each signal's mean square is taken over its own length only.
+    Returns (nominal centres, levels of shape (len(signals), n_bands)).
+    """
+    centers, sos = filterbank(sr, fraction, nominal)
+    lengths = np.array([len(x) for x in signals])
+    power = np.empty((len(signals), len(centers)))
+    for rows in length_buckets(lengths):
+        block = np.zeros((len(rows), lengths[rows].max()))
+        for row, i in zip(block, rows):
+            row[:lengths[i]] = signals[i]
+        valid = np.arange(block.shape[1]) < lengths[rows, np.newaxis]
+        for b in range(len(centers)):
+            y = signal.sosfilt(sos[b], block, axis=-1)
+            y *= valid
+            power[rows, b] = np.einsum('ij,ij->i', y, y) / lengths[rows]
+    with np.errstate(divide="ignore"):
+        return centers, 10 * np.log10(power)
+
+def _bands_batch(paths, fraction, nominal):
+    """Worker: [(path, levels or None)] for one batch of files."""
+    by_rate = {}
+    for p in paths:
+        sr, data = read_wav(p)
+        if len(data):
+            by_rate.setdefault(sr, []).append((p, data))
+    results = {p: None for p in paths}
+    for sr, items in by_rate.items():
+        _, levels = band_levels([d for _, d in items], sr, fraction, nominal)
+        for (p, _), row in zip(items, levels):
+            results[p] = row
+    return [(p, results[p]) for p in paths]
+
+def corpus_band_levels(paths, fraction=3, n_jobs=None, batch_size=BATCH_SIZE):
+    """
+    Per-file band levels (dBFS) over a corpus, in batches on a process
+    pool. Files may have different sample rates; every file is analysed in
+    the bands that fit below the lowest Nyquist frequency among them.
+
+    Returns a dict with centers, paths (files included, in input order),
+    skipped, per_file (n_files x n_bands, dB) and mean (power mean, dB).
+    """
+    paths = list(paths)
+    if not paths:
+        raise ValueError("No files to analyse")
+
+    min_sr = min(sample_rate(p) for p in paths)
+    nominal = tuple(bands_below(default_centers(fraction), min_sr, fraction))
+
+    batches = [paths[i:i + batch_size] for i in range(0, len(paths), batch_size)]
+    if len(batches) > 1 and n_jobs != 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            done = pool.map(_bands_batch, batches, [fraction] * len(batches), [nominal] * len(batches))
+            done = [r for batch in done for r in batch]
+    else:
+        done = [r for batch in batches for r in _bands_batch(batch, fraction, nominal)]
+
+    levels = dict(done)
+    included = [p for p in paths if levels[p] is not None]
+    per_file = np.array([levels[p] for p in included]).reshape(len(included), len(nominal))
+    mean = power_mean_db(per_file) if included else None
+    return {
+        "centers": list(nominal),
+        "paths": included,
+        "skipped": [p for p in paths if levels[p] is None],
+        "per_file": per_file,
+        "mean": mean,
+    }
@@ -0,0 +1,170 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from audio_tools.manifest import file_digest
+from audio_tools.wavio import PCM_FORMATS, read_pcm, to_float32, to_mono
+from audio_tools import segment
+
+INDEX_NAME = ".boundary_index.json"
+INDEX_VERSION = 2
+
+def _params_key(params):
+    return json.dumps(params, sort_keys=True)
+
+def _chunk_trim(sr, raw, silence_threshold, chunk_size):
+    # pydub-style chunked RMS trim on the integer samples
+    scale, offset = PCM_FORMATS.get(raw.dtype, (1.0, 0))
+    samples = raw.astype(np.int16) - offset if offset else raw
+    return segment.silence_bounds(samples, sr, silence_threshold, chunk_size, max_amplitude=scale)
+
+def _peak_trim(sr, raw, threshold_db):
+    return segment.peak_trim_bounds(to_mono(to_float32(raw)), threshold_db)
+
+def _rms_trim(sr, raw, threshold_db, window):
+    return segment.rms_trim_bounds(to_float32(raw), sr, threshold_db, window)
+
+def _target_word(sr, raw, **params):
+    return segment.target_word_bounds(to_mono(to_float32(raw)), sr, **params)
+
+def _silences(sr, raw, noise_db, min_silence):
+    return segment.silence_runs(to_float32(raw), sr, noise_db, min_silence)
+
+# kind -> function(sr, raw_pcm, **params) returning the boundaries to store.
+# Trims return (start, end); "silences" returns a list of (start, end) runs.
+KINDS = {
+    "chunk_trim": _chunk_trim,
+    "peak_trim": _peak_trim,
+    "rms_trim": _rms_trim,
+    "target_word": _target_word,
+    "silences": _silences,
+}
+
+def compute(path, requests):
+    """
+    Decodes `path` once and computes every (kind, params) in `requests`.
+    Returns a list of results in the same order.
+    """
+    sr, raw = read_pcm(path)
+    return [KINDS[kind](sr, raw, **params) for kind, params in requests]
+
+def _compute_job(job):
+    path, requests = job
+    try:
+        return compute(path, requests), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+def _to_json(value):
+    return json.loads(json.dumps(value, default=int))
+
+class BoundaryIndex:
+    """
+    Persistent table of sample boundaries per audio file, keyed on the
+    file's content hash, then on the kind of boundary (e.g. "target_word")
+    and the parameters it was computed with.
+
+    A path -> (size, mtime, sha256) map avoids re-hashing unchanged files.
+    Saving prunes paths that no longer exist and the boundaries of content
+    no recorded path has any more (e.g. a file's previous version).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.data = {"version": INDEX_VERSION, "paths": {}, "files": {}}
+        self.dirty = False
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+                if data.get("version") == INDEX_VERSION:
+                    self.data = data
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable boundary index {path}: {e}")
+
+    def digest(self, path):
+        key = os.path.abspath(path)
+        st = os.stat(path)
+        known = self.data["paths"].get(key)
+        if known and known["size"] == st.st_size and known["mtime_ns"] == st.st_mtime_ns:
+            return known["sha256"]
+        sha = file_digest(path)
+        self.data["paths"][key] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": sha}
+        self.dirty = True
+        return sha
+
+    def lookup(self, path, kind, params):
+        entry = self.data["files"].get(self.digest(path), {}).get(kind, {})
+        bounds = entry.get(_params_key(params))
+        if bounds is None:
+            return None
+        if bounds and isinstance(bounds[0], list):
+            return [tuple(b) for b in bounds]
+        return tuple(bounds)
+
+    def store(self, path, kind, params, bounds):
+        kinds = self.data["files"].setdefault(self.digest(path), {})
+        kinds.setdefault(kind, {})[_params_key(params)] = _to_json(bounds)
+        self.dirty = True
+
+    def get(self, path, kind, params):
+        """lookup(), computing and storing the entry if it is missing."""
+        bounds = self.lookup(path, kind, params)
+        if bounds is None:
+            bounds = compute(path, [(kind, params)])[0]
+            self.store(path, kind, params, bounds)
+            bounds = self.lookup(path, kind, params)
+        return bounds
+
+    def build(self, paths, requests, n_jobs=None):
+        """
+        Makes sure every path has every (kind, params) in `requests`,
+        decoding each file with missing entries once, on a process pool.
+        Saves the index and returns {path: error} for files that failed.
+        """
+        jobs = []
+        for path in paths:
+            missing = [(k, p) for k, p in requests if self.lookup(path, k, p) is None]
+            if missing:
+                jobs.append((path, missing))
+
+        errors = {}
+        if len(jobs) > 1 and n_jobs != 1:
+            with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                results = list(pool.map(_compute_job, jobs, chunksize=8))
+        else:
+            results = [_compute_job(job) for job in jobs]
+
+        for (path, missing), (values, error) in zip(jobs, results):
+            if error:
+                errors[path] = error
+                continue
+            for (kind, params), value in zip(missing, values):
+                self.store(path, kind, params, value)
+        self.save()
+        return errors
+
+    def prune(self):
+        """Drops paths that no longer exist and hashes no path refers to."""
+        paths = self.data["paths"]
+        gone = [key for key in paths if not os.path.exists(key)]
+        for key in gone:
+            del paths[key]
+        live = {entry["sha256"] for entry in paths.values()}
+        dead = [sha for sha in self.data["files"] if sha not in live]
+        for sha in dead:
+            del self.data["files"][sha]
+        if gone or dead:
+            self.dirty = True
+
+    def save(self):
+        self.prune()
+        if not self.dirty:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.data, f, separators=(",", ":"), sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
@@ -0,0 +1,151 @@
+import json
+import os
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from audio_tools.levels import dbfs
+from audio_tools.manifest import BuildManifest
+from audio_tools.wavio import read_wav
+
+FFMPEG_BIN = "ffmpeg"
+
+# Compressed variants written next to each wav: extension and encoder args
+EXPORT_FORMATS = {
+    "flac": {"ext": ".flac", "args": ["-c:a", "flac", "-compression_level", "8"]},
+    "opus": {"ext": ".opus", "args": ["-c:a", "libopus", "-b:a", "96k", "-vbr", "on"]},
+}
+
+# Max allowed difference between the decoded RMS and the reference level
+LEVEL_TOLERANCE_DB = 0.5
+
+ASSET_MANIFEST_NAME = "assets.json"
+
+def encode(src, dst, fmt, ffmpeg=FFMPEG_BIN):
+    cmd = [ffmpeg, "-y", "-v", "error", "-i", src] + EXPORT_FORMATS[fmt]["args"] + [dst]
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+def decode(path, sample_fmt="f32le", dtype="<f4", ffmpeg=FFMPEG_BIN):
+    """All decoded samples of a file, interleaved, as a flat array of `dtype`."""
+    cmd = [ffmpeg, "-v", "error", "-i", path, "-f", sample_fmt, "-acodec", f"pcm_{sample_fmt}", "-"]
+    result = subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    return np.frombuffer(result.stdout, dtype=dtype)
+
+def decoded_dbfs(path, ffmpeg=FFMPEG_BIN):
+    """
+    RMS level of a file after decoding it with ffmpeg, over all samples of
+    all channels (the same definition as pydub's dBFS).
+    """
+    return dbfs(decode(path, ffmpeg=ffmpeg))
+
+def export_file(job):
+    """
+    Encodes one wav to every requested format and checks each decoded
+    result's RMS against `target_db` (or against the wav itself when it is
+    None). Runs in worker processes, so it returns (job, variants, error)
+    instead of printing; variants maps format -> {path, bytes, dbfs}.
+    """
+    src, formats, target_db, tolerance = job
+    try:
+        reference = target_db
+        if reference is None:
+            _, data = read_wav(src, mono=False)
+            reference = dbfs(data)
+
+        variants = {}
+        base = os.path.splitext(src)[0]
+        for fmt in formats:
+            dst = base + EXPORT_FORMATS[fmt]["ext"]
+            encode(src, dst, fmt)
+            level = decoded_dbfs(dst)
+            if abs(level - reference) > tolerance:
+                return job, variants, f"{fmt} decodes at {level:.2f} dBFS, expected {reference:.2f} +/- {tolerance} dB"
+            variants[fmt] = {"path": dst, "bytes": os.path.getsize(dst), "dbfs": round(level, 2)}
+    except subprocess.CalledProcessError as e:
+        return job, {}, f"ffmpeg failed: {e.stderr.decode(errors='replace').strip()}"
+    except Exception as e:
+        return job, {}, f"{type(e).__name__}: {e}"
+    return job, variants, None
+
+def export_params(fmt, target_db, tolerance):
+    return {"args": EXPORT_FORMATS[fmt]["args"], "target_db": target_db, "tolerance": tolerance}
+
+def run_exports(wavs, formats, n_jobs=1, tolerance=LEVEL_TOLERANCE_DB, manifest=None):
+    """
+    Exports `wavs`, a list of (wav_path, target_db) pairs, to `formats`
+    on a process pool. Files whose variants are all up to date in the
+    build `manifest` are skipped. Returns (results, failures): results maps
+    each wav path to its variants, failures is a list of (path, error).
+    """
+    jobs = []
+    for src, target_db in wavs:
+        base = os.path.splitext(src)[0]
+        if manifest is not None and all(
+            manifest.is_fresh(src, base + EXPORT_FORMATS[fmt]["ext"], export_params(fmt, target_db, tolerance))
+            for fmt in formats
+        ):
+            continue
+        jobs.append((src, formats, target_db, tolerance))
+
+    if n_jobs > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            outcomes = list(pool.map(export_file, jobs, chunksize=4))
+    else:
+        outcomes = [export_file(job) for job in jobs]
+
+    results = {}
+    failures = []
+    for (src, _, target_db, _), variants, error in outcomes:
+        if error:
+            failures.append((src, error))
+            continue
+        results[src] = variants
+        if manifest is not None:
+            for fmt, variant in variants.items():
+                manifest.record(src, variant["path"], export_params(fmt, target_db, tolerance))
+    print(f"Exported {len(results)} file(s), {len(wavs) - len(jobs)} up to date, {len(failures)} failed.")
+    return results, failures
+
+def update_asset_manifest(audio_dir, wavs, formats):
+    """
+    Writes <audio_dir>/assets.json, mapping "<folder>/<name>" (e.g.
+    "HF1/01_Check") to the URL and byte size of the wav and each exported
+    format. URLs are relative to the app root ("audio/HF1/01_Check.flac").
+    Entries for files not in `wavs` are kept.
+    """
+    path = os.path.join(audio_dir, ASSET_MANIFEST_NAME)
+    assets = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            assets = json.load(f)
+
+    root = os.path.dirname(os.path.abspath(audio_dir))
+    for src in wavs:
+        key = os.path.splitext(os.path.relpath(src, audio_dir))[0].replace(os.sep, "/")
+        base = os.path.splitext(src)[0]
+        entry = {}
+        for fmt, ext in [("wav", ".wav")] + [(f, EXPORT_FORMATS[f]["ext"]) for f in formats]:
+            asset = base + ext
+            if os.path.exists(asset):
+                url = os.path.relpath(os.path.abspath(asset), root).replace(os.sep, "/")
+                entry[fmt] = {"url": url, "bytes": os.path.getsize(asset)}
+        assets[key] = entry
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(assets, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+    return path
+
+def export_step(audio_dir, wavs, formats, n_jobs=1, manifest_step="export"):
+    """
+    The whole stage: exports, records the variants in the build manifest
+    and refreshes assets.json. `wavs` is a list of (wav_path, target_db).
+    Returns the list of failures.
+    """
+    manifest = BuildManifest(audio_dir, manifest_step)
+    _, failures = run_exports(wavs, formats, n_jobs, manifest=manifest)
+    manifest.save()
+    update_asset_manifest(audio_dir, [src for src, _ in wavs], formats)
+    return failures
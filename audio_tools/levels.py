@@ -0,0 +1,173 @@
+import os
+import numpy as np
+
+from audio_tools.wavio import (
+    read_pcm, read_wav, map_wav, frames_to_float32, to_float32, to_mono, from_float32, write_pcm,
+    sample_width
+)
+
+# Frames per block for streaming measurements (~1.5 s at 44.1 kHz)
+STREAM_BLOCK_FRAMES = 1 << 16
+
+def mean_square(data):
+    if data.size == 0:
+        return 0.0
+    return float(np.mean(np.square(data), dtype=np.float64))
+
+def rms(data):
+    return np.sqrt(mean_square(data))
+
+def to_db(value):
+    if value <= 0:
+        return -np.inf
+    return 20 * np.log10(value)
+
+def dbfs(data):
+    """RMS level of float samples in dB relative to full scale (1.0)."""
+    return to_db(rms(data))
+
+def peak(data):
+    if data.size == 0:
+        return 0.0
+    return float(np.max(np.abs(data)))
+
+def measure(data):
+    """Returns a dict with rms, dbfs, peak and peak_dbfs of float samples."""
+    level = rms(data)
+    pk = peak(data)
+    return {
+        "rms": level,
+        "dbfs": to_db(level),
+        "peak": pk,
+        "peak_dbfs": to_db(pk),
+    }
+
+def mean_volume_db(data):
+    """
+    Same figure as ffmpeg volumedetect's mean_volume: mean power of all
+    samples (every channel pooled, no downmix) after quantizing to 16-bit,
+    in dB re full scale; digital silence reads -91 dB.
+    `data` is float samples in [-1.0, 1.0).
+    """
+    if data.size == 0:
+        return -91.0
+    s16 = np.clip(np.round(data.ravel() * 32768.0), -32768, 32767)
+    power = float(np.dot(s16, s16)) / s16.size / (32768.0 * 32768.0)
+    if power == 0:
+        return -91.0
+    return 10 * np.log10(power)
+
+def apply_gain_db(data, gain_db):
+    return data * np.float32(10 ** (gain_db / 20.0))
+
+def file_dbfs(path, mono=True):
+    """
+    RMS level of a wav file in dBFS. With mono=False all channels are
+    pooled instead of being averaged to mono first.
+    """
+    _, data = read_wav(path, mono=mono)
+    return dbfs(data)
+
+def measure_file(path, mono=True, channel=None, block_frames=STREAM_BLOCK_FRAMES):
+    """
+    Streams a wav file through a memory map in fixed-size blocks and
+    returns the same fields as measure() plus crest_factor_db, frames,
+    duration and sample_rate. Memory use does not depend on file length.
+
+    channel selects a single channel; otherwise channels are averaged
+    (mono=True) or pooled (mono=False).
+    """
+    sr, raw = map_wav(path)
+    if channel is not None:
+        raw = raw[:, channel:channel + 1]
+
+    sum_sq = 0.0
+    n_samples = 0
+    pk = 0.0
+    for start in range(0, len(raw), block_frames):
+        block = frames_to_float32(raw[start:start + block_frames])
+        if mono:
+            block = to_mono(block)
+        block = block.ravel().astype(np.float64)
+        sum_sq += float(np.dot(block, block))
+        n_samples += block.size
+        pk = max(pk, float(np.max(np.abs(block))))
+
+    level = np.sqrt(sum_sq / n_samples) if n_samples else 0.0
+    return {
+        "sample_rate": sr,
+        "frames": len(raw),
+        "duration": len(raw) / sr if sr else 0.0,
+        "rms": level,
+        "dbfs": to_db(level),
+        "peak": pk,
+        "peak_dbfs": to_db(pk),
+        "crest_factor_db": to_db(pk) - to_db(level) if level > 0 else np.inf,
+    }
+
+def meter_file(path, block_frames=STREAM_BLOCK_FRAMES):
+    """
+    Per-channel RMS and peak of any 8/16/24/32-bit or float wav, read
+    through a memory map of the raw frames in one vectorized pass.
+
+    Returns sample_rate, frames, duration, bits, is_float, a "channels"
+    list of {rms, dbfs, peak, peak_dbfs}, rms/dbfs/peak with all channels
+    pooled, and clipped: the number of samples at digital full scale.
+    """
+    sr, raw = map_wav(path)
+    n_channels = raw.shape[1]
+    bits = 24 if raw.ndim == 3 else raw.dtype.itemsize * 8
+    is_float = raw.dtype.kind == 'f'
+    # Largest positive code of the format, as a float
+    full_scale = np.float32(1.0 if is_float else 1.0 - 2.0 ** -(bits - 1))
+
+    sum_sq = np.zeros(n_channels)
+    pk = np.zeros(n_channels)
+    clipped = 0
+    for start in range(0, len(raw), block_frames):
+        block = frames_to_float32(raw[start:start + block_frames])
+        sum_sq += np.einsum('ij,ij->j', block, block, dtype=np.float64)
+        np.maximum(pk, np.max(np.abs(block), axis=0), out=pk)
+        clipped += int(np.count_nonzero((block >= full_scale) | (block <= -1.0)))
+
+    n_frames = len(raw)
+    channel_rms = np.sqrt(sum_sq / n_frames) if n_frames else np.zeros(n_channels)
+    pooled = np.sqrt(sum_sq.sum() / (n_frames * n_channels)) if n_frames else 0.0
+    return {
+        "sample_rate": sr,
+        "frames": n_frames,
+        "duration": n_frames / sr if sr else 0.0,
+        "bits": bits,
+        "is_float": is_float,
+        "clipped": clipped,
+        "channels": [
+            {"rms": float(r), "dbfs": to_db(r), "peak": float(p), "peak_dbfs": to_db(p)}
+            for r, p in zip(channel_rms, pk)
+        ],
+        "rms": float(pooled),
+        "dbfs": to_db(pooled),
+        "peak": float(pk.max()) if n_channels else 0.0,
+        "peak_dbfs": to_db(pk.max()) if n_channels else -np.inf,
+    }
+
+def normalize_mean_volume(path, target_db, tolerance_db=0.0):
+    """
+    Measures a wav's mean_volume (see mean_volume_db) and, if it is more
+    than tolerance_db away from target_db, rewrites the file in place with
+    the gain applied, keeping its sample format (24-bit files stay 24-bit).
+    Decodes once, writes once.
+
+    Returns (mean_volume_before, gain_db), with gain_db None when the file
+    was already within tolerance.
+    """
+    sr, raw = read_pcm(path)
+    data = to_float32(raw)
+    current = mean_volume_db(data)
+    gain_db = target_db - current
+    if abs(gain_db) <= tolerance_db:
+        return current, None
+
+    tmp_path = path + ".tmp.wav"
+    write_pcm(tmp_path, sr, from_float32(apply_gain_db(data, gain_db), raw.dtype), sample_width(path))
+    os.replace(tmp_path, path)
+    return current, gain_db
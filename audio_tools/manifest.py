@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+
+MANIFEST_NAME = ".build_manifest.json"
+MANIFEST_VERSION = 1
+
+def file_digest(path, block_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def _canonical(params):
+    # JSON round trip so tuples/lists and int/float keys compare the same
+    # way they will after being reloaded from disk
+    return json.loads(json.dumps(params, sort_keys=True))
+
+class BuildManifest:
+    """
+    Records, per build step and output file, the content hash of the source
+    it was built from and the processing parameters used.
+
+    Hashes are only recomputed when a file's size or mtime changed since it
+    was recorded, so checking an up-to-date tree only costs one stat() per
+    source and output.
+
+    Steps that rewrite files in place pass the same path as src and dst,
+    and record the hash the file had before (`replaced`). A step lists the
+    steps that rewrite its outputs afterwards in `later_steps`; an output
+    such a step made from exactly this step's recorded output still counts
+    as fresh, so running the whole pipeline twice does nothing the second
+    time. Saving prunes entries, in every step, whose output file is gone.
+    """
+
+    def __init__(self, manifest_dir, step, later_steps=()):
+        self.path = os.path.join(manifest_dir, MANIFEST_NAME)
+        self.base_dir = manifest_dir
+        self.step = step
+        self.later_steps = list(later_steps)
+        self.data = {"version": MANIFEST_VERSION, "steps": {}}
+
+        if os.path.exists(self.path):
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+                if data.get("version") == MANIFEST_VERSION:
+                    self.data = data
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable manifest {self.path}: {e}")
+
+        self.entries = self.data["steps"].setdefault(step, {})
+
+    def _key(self, dst):
+        return os.path.relpath(os.path.abspath(dst), self.base_dir)
+
+    def _fingerprint(self, path, recorded=None):
+        st = os.stat(path)
+        if recorded and recorded["size"] == st.st_size and recorded["mtime_ns"] == st.st_mtime_ns:
+            return recorded
+        return {"sha256": file_digest(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+    def is_fresh(self, src, dst, params):
+        entry = self.entries.get(self._key(dst))
+        if not entry or entry["params"] != _canonical(params):
+            return False
+        if not os.path.exists(src) or not os.path.exists(dst):
+            return False
+
+        source = self._fingerprint(src, entry["source"])
+        if source["sha256"] != entry["source"]["sha256"]:
+            return False
+        if not self._output_matches(dst, entry):
+            return False
+
+        # Refresh stat info so the next check can skip hashing again
+        entry["source"] = source
+        return True
+
+    def _output_matches(self, dst, entry):
+        """
+        Whether dst still holds this step's recorded output, or what a later
+        step made of it in place (and nothing has touched it since).
+        """
+        return self._own_output(dst, entry) or self._later_output(dst, entry)
+
+    def _own_output(self, dst, entry):
+        output = self._fingerprint(dst, entry["output"])
+        if output["sha256"] == entry["output"]["sha256"]:
+            entry["output"] = output
+            return True
+        return False
+
+    def _later_output(self, dst, entry):
+        for step in self.later_steps:
+            later = self.data["steps"].get(step, {}).get(self._key(dst))
+            if later and later.get("replaced") == entry["output"]["sha256"]:
+                current = self._fingerprint(dst, later["output"])
+                if current["sha256"] == later["output"]["sha256"]:
+                    later["output"] = current
+                    return True
+        return False
+
+    def rewritten_later(self, dst):
+        """Whether dst now holds a later step's in-place rewrite of this step's output."""
+        entry = self.entries.get(self._key(dst))
+        if not entry or not os.path.exists(dst):
+            return False
+        return not self._own_output(dst, entry) and self._later_output(dst, entry)
+
+    def stale_outputs(self, dsts):
+        """Paths recorded as outputs of this step that are not among `dsts`."""
+        keep = {self._key(dst) for dst in dsts}
+        return [os.path.join(self.base_dir, key) for key in self.entries if key not in keep]
+
+    def record(self, src, dst, params, replaced=None):
+        """
+        `replaced` is the sha256 dst had before an in-place step rewrote it
+        (see file_digest).
+        """
+        output = self._fingerprint(dst)
+        source = output if os.path.abspath(src) == os.path.abspath(dst) else self._fingerprint(src)
+        entry = {
+            "source": source,
+            "output": output,
+            "params": _canonical(params),
+        }
+        if replaced is not None:
+            entry["replaced"] = replaced
+        self.entries[self._key(dst)] = entry
+
+    def prune(self):
+        """Drops entries whose output no longer exists; returns how many."""
+        removed = 0
+        for entries in self.data["steps"].values():
+            gone = [key for key in entries if not os.path.exists(os.path.join(self.base_dir, key))]
+            for key in gone:
+                del entries[key]
+            removed += len(gone)
+        return removed
+
+    def save(self):
+        self.prune()
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.data, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
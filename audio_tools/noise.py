@@ -0,0 +1,109 @@
+import numpy as np
+import scipy.signal as signal
+
+# FFT size used for long-term spectrum estimation and noise synthesis.
+# 4096 points at 44.1 kHz gives ~10.8 Hz resolution.
+FRAME_SIZE = 4096
+
+# Block length for streamed noise; memory use is a few blocks, whatever
+# the duration
+STREAM_BLOCK = 1 << 16
+
+# 1/f ("pinking") IIR filter, within ~0.05 dB of -3 dB/octave from about
+# 10 Hz to Nyquist at 44.1 kHz (J. O. Smith, "Spectral Audio Signal Processing")
+PINK_B = [0.049922035, -0.095993537, 0.050612699, -0.004408786]
+PINK_A = [1.0, -2.494956002, 2.017265875, -0.522189400]
+
+def analysis_window(frame_size):
+    # Periodic Hann, as used by scipy.signal.welch
+    return np.hanning(frame_size + 1)[:-1].astype(np.float32)
+
+def synthesis_window(frame_size):
+    # sqrt-Hann: its square overlap-adds to exactly 1 at 50% overlap, so
+    # the synthesized noise has constant power over time
+    return np.sqrt(analysis_window(frame_size))
+
+def frame_signal(data, frame_size, hop=None):
+    """
+    Returns a (n_frames, frame_size) view of `data` with `hop` samples
+    between frame starts (default 50% overlap). Signals shorter than one
+    frame are zero-padded to a single frame.
+    """
+    hop = hop or frame_size // 2
+    if len(data) < frame_size:
+        data = np.pad(data, (0, frame_size - len(data)))
+    return np.lib.stride_tricks.sliding_window_view(data, frame_size)[::hop]
+
+def accumulate_power_spectrum(data, frame_size=FRAME_SIZE):
+    """
+    Returns (power_sum, n_frames): the summed |rfft|^2 of Hann-windowed,
+    50%-overlapped frames. Sums from several files can be added together
+    and divided by the total frame count to get the long-term spectrum.
+    """
+    frames = frame_signal(data, frame_size) * analysis_window(frame_size)
+    spectra = np.fft.rfft(frames, axis=1)
+    power = (spectra.real ** 2 + spectra.imag ** 2).sum(axis=0, dtype=np.float64)
+    return power, len(frames)
+
+def synthesize_noise(magnitude, n_samples, frame_size=FRAME_SIZE, rng=None):
+    """
+    Overlap-adds random-phase frames with the given rfft magnitude
+    (length frame_size // 2 + 1) into `n_samples` of stationary noise.
+    Memory is the output buffer plus one frame, whatever the duration.
+    """
+    rng = rng or np.random.default_rng()
+    hop = frame_size // 2
+    window = synthesis_window(frame_size)
+
+    # One frame of run-in on each side so the edges get full overlap too
+    out = np.zeros(n_samples + 2 * frame_size, dtype=np.float64)
+    for start in range(0, n_samples + frame_size, hop):
+        phases = np.exp(2j * np.pi * rng.random(len(magnitude)))
+        out[start:start + frame_size] += np.fft.irfft(magnitude * phases, n=frame_size) * window
+    return out[frame_size:frame_size + n_samples]
+
+def pink_sos():
+    return signal.tf2sos(PINK_B, PINK_A)
+
+def filtered_noise_blocks(n_samples, sos, seed, block_size=STREAM_BLOCK, warmup=STREAM_BLOCK):
+    """
+    Yields `n_samples` of white Gaussian noise run through the `sos`
+    cascade, one block at a time. Filter state carries across blocks, so
+    the stream is the same as filtering one long buffer; the first
+    `warmup` samples are dropped so the filters' start-up transient is not
+    in the output. The same seed always gives the same stream.
+    """
+    rng = np.random.default_rng(seed)
+    zi = np.zeros((sos.shape[0], 2))
+    remaining = n_samples + warmup
+    while remaining > 0:
+        n = min(block_size, remaining)
+        y, zi = signal.sosfilt(sos, rng.standard_normal(n), zi=zi)
+        remaining -= n
+
+        if warmup:
+            skip = min(warmup, n)
+            y = y[skip:]
+            warmup -= skip
+        if len(y):
+            yield y
+
+def synthesize_loop(magnitude, n_samples, rng=None):
+    """
+    `n_samples` of noise that loops seamlessly. Every bin of the
+    n_samples-point FFT gets the target magnitude (interpolated in power
+    from `magnitude`, which spans 0 Hz to Nyquist) and a random phase, so
+    the buffer is exactly periodic: its spectrum is exact at this length
+    and there is no discontinuity at the wrap point, so no crossfade is needed.
+    """
+    rng = rng or np.random.default_rng()
+    n_bins = n_samples // 2 + 1
+    grid = np.linspace(0.0, 1.0, n_bins)
+    target = np.sqrt(np.interp(grid, np.linspace(0.0, 1.0, len(magnitude)), np.square(magnitude)))
+
+    spectrum = target * np.exp(2j * np.pi * rng.random(n_bins))
+    spectrum[0] = 0.0
+    if n_samples % 2 == 0:
+        # The Nyquist bin of an even-length real signal has no phase
+        spectrum[-1] = target[-1]
+    return np.fft.irfft(spectrum, n=n_samples)
@@ -0,0 +1,155 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.signal import resample_poly
+
+from audio_tools.wavio import map_wav, read_wav
+
+# Files handed to each worker per task; all their frames go through one FFT
+BATCH_SIZE = 16
+
+# Part of every PSDCache key; bump when the spectra computed here change
+PSD_VERSION = 2
+
+def sample_rate(path):
+    # Header only; map_wav handles every format, 24-bit included
+    return map_wav(path)[0]
+
+def _frames(data, nperseg):
+    # Welch framing: nperseg // 2 overlap (so the hop is nperseg - nperseg // 2,
+    # as in scipy), trailing partial segment dropped. Signals shorter than
+    # one segment are zero-padded to one segment.
+    if len(data) < nperseg:
+        data = np.pad(data, (0, nperseg - len(data)))
+    return np.lib.stride_tricks.sliding_window_view(data, nperseg)[::nperseg - nperseg // 2]
+
+def segment_count(n_samples, nperseg):
+    """Number of Welch segments _frames takes from n_samples samples."""
+    if n_samples < nperseg:
+        return 1
+    return (n_samples - nperseg) // (nperseg - nperseg // 2) + 1
+
+def batched_welch(signals, fs, nperseg):
+    """
+    Welch PSDs (Hann window, 50% overlap, constant detrend, density
+    scaling, one-sided; same as scipy.signal.welch defaults) of several
+    equal-rate signals, odd or even nperseg. All their segments are
+    stacked into one 2-D array and transformed with a single rfft call.
+    Unlike scipy, a signal shorter than nperseg is zero-padded rather than
+    analysed with a shorter segment.
+
+    Returns (freqs, psds) with psds shaped (len(signals), nperseg // 2 + 1).
+    """
+    frames = [_frames(np.asarray(x, dtype=np.float64), nperseg) for x in signals]
+    counts = np.array([len(f) for f in frames])
+    stacked = np.concatenate(frames)
+
+    window = np.hanning(nperseg + 1)[:-1]
+    stacked = (stacked - stacked.mean(axis=1, keepdims=True)) * window
+    spectra = np.fft.rfft(stacked, axis=1)
+    power = spectra.real ** 2 + spectra.imag ** 2
+
+    power *= 1.0 / (fs * np.sum(window ** 2))
+    power[:, 1:-1 if nperseg % 2 == 0 else None] *= 2
+
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    psds = np.add.reduceat(power, offsets, axis=0) / counts[:, np.newaxis]
+    return np.fft.rfftfreq(nperseg, 1.0 / fs), psds
+
+def _load(path, fs, preprocess):
+    sr, data = read_wav(path)
+    if sr != fs:
+        g = np.gcd(sr, fs)
+        data = resample_poly(data, fs // g, sr // g).astype(np.float32)
+    if preprocess is not None:
+        data = preprocess(data, fs, path)
+    return data
+
+def _psd_batch(paths, fs, nperseg, preprocess):
+    """Worker: returns [(path, psd or None)] for one batch of files."""
+    loaded = [(p, _load(p, fs, preprocess)) for p in paths]
+    usable = [(p, d) for p, d in loaded if d is not None and len(d) > 0]
+    results = {p: None for p in paths}
+    if usable:
+        _, psds = batched_welch([d for _, d in usable], fs, nperseg)
+        for (p, _), psd in zip(usable, psds):
+            results[p] = psd
+    return [(p, results[p]) for p in paths]
+
+def corpus_psd(paths, nperseg=1024, resample_to=None, preprocess=None,
+               preprocess_params=None, cache=None, n_jobs=None, batch_size=BATCH_SIZE):
+    """
+    Per-file, mean and median Welch PSDs over a corpus, computed in
+    batches on a process pool.
+
+    All files must share one sample rate unless resample_to is given, in
+    which case every file is resampled to it first; mixed rates without
+    resample_to raise ValueError rather than being dropped.
+
+    preprocess(data, fs, path) -> data or None may trim or gate each file before
+    analysis (it must be a module-level function so it can be pickled);
+    returning None leaves the file out. preprocess_params (JSON-serializable)
+    must describe every setting the preprocess depends on: it is part of
+    the cache key, with the function's name. With a PSDCache, per-file
+    results are reused across runs.
+
+    Returns a dict with freqs, fs, paths (files included, in input order),
+    skipped, per_file (n_files x n_bins), mean and median.
+    """
+    paths = list(paths)
+    if not paths:
+        raise ValueError("No files to analyse")
+
+    rates = {p: sample_rate(p) for p in paths}
+    if resample_to is None:
+        distinct = sorted(set(rates.values()))
+        if len(distinct) > 1:
+            by_rate = {r: sum(1 for v in rates.values() if v == r) for r in distinct}
+            raise ValueError(f"Mixed sample rates {by_rate}; pass resample_to to analyse them together")
+        fs = distinct[0]
+    else:
+        fs = resample_to
+
+    params = {
+        "engine": "corpus_psd",
+        "version": PSD_VERSION,
+        "nperseg": nperseg,
+        "fs": fs,
+        "preprocess": getattr(preprocess, "__qualname__", None),
+        "preprocess_params": preprocess_params,
+    }
+    psds = {}
+    todo = []
+    for p in paths:
+        hit = cache.get(p, params) if cache is not None else None
+        if hit is None:
+            todo.append(p)
+        else:
+            psds[p] = hit[1]
+
+    batches = [todo[i:i + batch_size] for i in range(0, len(todo), batch_size)]
+    if len(batches) > 1 and n_jobs != 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            done = pool.map(_psd_batch, batches, [fs] * len(batches),
+                            [nperseg] * len(batches), [preprocess] * len(batches))
+            done = [r for batch in done for r in batch]
+    else:
+        done = [r for batch in batches for r in _psd_batch(batch, fs, nperseg, preprocess)]
+
+    freqs = np.fft.rfftfreq(nperseg, 1.0 / fs)
+    for p, psd in done:
+        psds[p] = psd
+        if cache is not None:
+            cache.put(p, params, freqs, psd)
+
+    included = [p for p in paths if psds[p] is not None]
+    per_file = np.array([psds[p] for p in included]).reshape(len(included), len(freqs))
+    return {
+        "freqs": freqs,
+        "fs": fs,
+        "paths": included,
+        "skipped": [p for p in paths if psds[p] is None],
+        "per_file": per_file,
+        "mean": per_file.mean(axis=0) if included else None,
+        "median": np.median(per_file, axis=0) if included else None,
+    }
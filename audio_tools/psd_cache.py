@@ -0,0 +1,73 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+class PSDCache:
+    """
+    On-disk cache of per-file linear PSDs, one .npz per entry.
+
+    Entries are keyed on the file's absolute path, size and mtime plus the
+    analysis parameters, so editing a wav or changing e.g. nperseg simply
+    misses the cache. A file that produced no spectrum (too short, etc.)
+    is cached as an empty array so it is not re-analysed either. Each entry
+    also records which file it was made from, so prune() can drop entries
+    for files that changed or no longer exist.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def _source(path):
+        st = os.stat(path)
+        return {"path": os.path.abspath(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+    def _entry_path(self, path, params):
+        key = json.dumps(dict(self._source(path), params=params), sort_keys=True)
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".npz")
+
+    def get(self, path, params):
+        """Returns (freqs, pxx), with pxx None for a cached miss, or None if not cached."""
+        entry = self._entry_path(path, params)
+        if not os.path.exists(entry):
+            return None
+        try:
+            with np.load(entry) as npz:
+                freqs, pxx = npz["freqs"], npz["pxx"]
+        except (OSError, ValueError, KeyError):
+            return None
+        return freqs, (pxx if pxx.size else None)
+
+    def put(self, path, params, freqs, pxx):
+        entry = self._entry_path(path, params)
+        tmp_path = entry + ".tmp.npz"
+        np.savez(tmp_path,
+                 freqs=np.asarray(freqs if freqs is not None else []),
+                 pxx=np.asarray(pxx if pxx is not None else []),
+                 source=np.array(json.dumps(self._source(path), sort_keys=True)))
+        os.replace(tmp_path, entry)
+
+    def prune(self):
+        """
+        Deletes entries whose source file is gone or has a different size
+        or mtime (they can never be hit again), and entries that cannot be
+        read. Returns the number of entries removed.
+        """
+        removed = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".npz"):
+                continue
+            entry = os.path.join(self.cache_dir, name)
+            try:
+                with np.load(entry) as npz:
+                    source = json.loads(str(npz["source"]))
+                stale = not os.path.exists(source["path"]) or self._source(source["path"]) != source
+            except (OSError, ValueError, KeyError):
+                stale = True
+            if stale:
+                os.remove(entry)
+                removed += 1
+        return removed
@@ -0,0 +1,179 @@
+import numpy as np
+
+def runs(mask):
+    """Returns (starts, ends) index arrays of the True runs in a 1-D bool mask."""
+    edges = np.diff(mask.astype(np.int8), prepend=0, append=0)
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+def silence_runs(data, sr, noise_db=-50.0, min_silence=0.5):
+    """
+    Vectorized equivalent of ffmpeg's silencedetect=noise=<noise_db>dB:d=<min_silence>.
+    A frame is silent when every channel's |sample| is below the threshold;
+    silences are runs of silent frames lasting at least min_silence seconds.
+    `data` is float samples, (frames,) or (frames, channels).
+
+    Returns a list of [start, end) sample index pairs.
+    """
+    thresh = 10 ** (noise_db / 20.0)
+    level = np.abs(data)
+    if level.ndim > 1:
+        level = level.max(axis=1)
+
+    starts, ends = runs(level < thresh)
+    keep = (ends - starts) >= int(round(min_silence * sr))
+    return [(int(s), int(e)) for s, e in zip(starts[keep], ends[keep])]
+
+def detect_silences(data, sr, noise_db=-50.0, min_silence=0.5):
+    """Same as silence_runs, in seconds: a list of (start_sec, end_sec) tuples."""
+    return [(s / sr, e / sr) for s, e in silence_runs(data, sr, noise_db, min_silence)]
+
+def silence_bounds(samples, frame_rate, silence_threshold=-50.0, chunk_size=10,
+                   max_amplitude=32768.0):
+    """
+    Returns (start, end) sample indices of the non-silent region.
+
+    Same semantics as walking the sound in `chunk_size` ms slices from both
+    ends and stopping at the first slice whose dBFS is >= `silence_threshold`,
+    but every slice RMS comes from one cumulative sum over the framed power,
+    so the whole file is scanned in a single vectorized pass.
+    `samples` is a (frames,) or (frames, channels) integer array.
+    """
+    samples = np.asarray(samples)
+    if samples.ndim == 1:
+        samples = samples[:, np.newaxis]
+    n_frames, channels = samples.shape
+    if n_frames == 0:
+        return 0, 0
+
+    chunk = max(1, int(round(frame_rate * chunk_size / 1000.0)))
+
+    # Running sum of per-frame power (all channels, like pydub's rms)
+    power = np.einsum('ij,ij->i', samples, samples, dtype=np.float64)
+    cum = np.concatenate(([0.0], np.cumsum(power)))
+
+    # dBFS < threshold  <=>  mean square < (max_amplitude * 10^(thr/20))^2
+    thresh_ms = (max_amplitude * 10 ** (silence_threshold / 20.0)) ** 2
+
+    # Leading chunks are aligned to the start of the file
+    lead_starts = np.arange(0, n_frames, chunk)
+    lead_ends = np.minimum(lead_starts + chunk, n_frames)
+    lead_ms = (cum[lead_ends] - cum[lead_starts]) / ((lead_ends - lead_starts) * channels)
+    loud = np.flatnonzero(lead_ms >= thresh_ms)
+    if len(loud) == 0:
+        return n_frames, n_frames
+    trim_start = int(lead_starts[loud[0]])
+
+    # Trailing chunks are aligned to the end of the file
+    trail_ends = np.arange(n_frames, trim_start, -chunk)
+    trail_starts = np.maximum(trail_ends - chunk, 0)
+    trail_ms = (cum[trail_ends] - cum[trail_starts]) / ((trail_ends - trail_starts) * channels)
+    loud = np.flatnonzero(trail_ms >= thresh_ms)
+    trim_end = int(trail_ends[loud[0]]) if len(loud) else trim_start
+
+    return trim_start, trim_end
+
+def peak_trim_bounds(data, threshold_db):
+    """
+    (start, end) from the first to the last sample whose |x| exceeds
+    threshold_db, both included. A file whose overall RMS is below the
+    threshold is treated as all silence and gives an empty range.
+    `data` is mono float samples.
+    """
+    n = len(data)
+    ms = np.mean(np.square(data), dtype=np.float64) if n else 0.0
+    if ms == 0:
+        return 0, n
+    if 10 * np.log10(ms) < threshold_db:
+        return 0, 0
+
+    loud = np.flatnonzero(np.abs(data) > 10 ** (threshold_db / 20))
+    if len(loud) == 0:
+        return 0, n
+    return int(loud[0]), int(loud[-1]) + 1
+
+def rms_trim_bounds(data, sr, threshold_db, window=0.02):
+    """
+    (start, end) of the region whose running RMS, over `window` seconds
+    centred on each frame, exceeds threshold_db: ffmpeg silenceremove's
+    default detection (detection=rms, window=0.02), applied from both ends.
+    Returns (0, 0) when no window gets above the threshold.
+    `data` is float samples, (frames,) or (frames, channels).
+    """
+    power = np.square(data, dtype=np.float64)
+    if power.ndim > 1:
+        power = power.mean(axis=1)
+    n = len(power)
+    if n == 0:
+        return 0, 0
+
+    w = max(1, int(round(window * sr)))
+    cum = np.concatenate(([0.0], np.cumsum(power)))
+    lo = np.clip(np.arange(n) - w // 2, 0, n)
+    hi = np.clip(np.arange(n) - w // 2 + w, 0, n)
+    loud = np.flatnonzero((cum[hi] - cum[lo]) / w > 10 ** (threshold_db / 10))
+    if len(loud) == 0:
+        return 0, 0
+    return int(loud[0]), int(loud[-1]) + 1
+
+def voice_segments(silences, lead_min=0.1, min_duration=0.2):
+    """
+    Turns silencedetect-style silence intervals into (start, end) speech
+    segments: the audio before the first silence (if it starts after
+    lead_min) and every gap between consecutive silences longer than
+    min_duration. Audio after the last silence is not returned.
+    """
+    segments = []
+    if silences and silences[0][0] > lead_min:
+        segments.append((0.0, silences[0][0]))
+
+    for (_, silence_end), (next_start, _) in zip(silences, silences[1:]):
+        if next_start - silence_end > min_duration:
+            segments.append((silence_end, next_start))
+    return segments
+
+def slice_padded(data, sr, start, end, padding):
+    """Returns data between start-padding and end+padding seconds, clipped to the file."""
+    s = max(0, int(round((start - padding) * sr)))
+    e = min(len(data), int(round((end + padding) * sr)))
+    return data[s:e], s / sr, e / sr
+
+def moving_average(x, window):
+    """
+    Centered boxcar mean, identical to
+    np.convolve(x, np.ones(window) / window, mode='same'), but O(n) via a
+    cumulative sum instead of O(n * window).
+    """
+    n = len(x)
+    c = np.concatenate(([0.0], np.cumsum(x, dtype=np.float64)))
+    idx = np.arange(n) + (window - 1) // 2
+    hi = np.minimum(idx + 1, n)
+    lo = np.clip(idx - window + 1, 0, n)
+    return (c[hi] - c[lo]) / window
+
+def target_word_bounds(data, sr, env_window=0.05, rel_thresh=0.1, min_len=0.1, padding=0.05):
+    """
+    (start, end) sample bounds of the target word in a carrier-phrase
+    recording ("Say the word ..."): the last envelope segment longer than
+    min_len seconds, padded by `padding` seconds. The envelope is a
+    env_window-second moving average of |x| thresholded at rel_thresh of
+    its maximum.
+
+    Recordings with fewer than two such segments have no detectable
+    carrier; the second half of the file is returned.
+    """
+    n = len(data)
+    env = moving_average(np.abs(data), int(env_window * sr))
+    starts, ends = runs(env > rel_thresh * np.max(env))
+
+    # Run starts are reported one sample early and ends inclusive, to
+    # match the original np.diff based edge detection
+    starts = np.maximum(starts - 1, 0)
+    ends = ends - 1
+    valid = (ends - starts) > int(min_len * sr)
+
+    if np.count_nonzero(valid) > 1:
+        pad = int(padding * sr)
+        word_start = max(0, int(starts[valid][-1]) - pad)
+        word_end = min(n, int(ends[valid][-1]) + pad)
+        return word_start, word_end
+    return n // 2, n
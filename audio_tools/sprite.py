@@ -0,0 +1,159 @@
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from audio_tools.wavio import read_pcm, write_pcm
+
+# Digital silence between words, so a player stopping a little late
+# never catches the next onset
+GAP_SEC = 0.05
+
+# The app's word tables; a sprite holds exactly the words of its list
+WORD_LISTS_JS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "data", "wordLists.js")
+
+def parse_word_file(filename):
+    """
+    "07_Youth.wav" -> (7, "YOUTH"), matching the {i, w} entries of
+    src/data/wordLists.js. Returns None for files without a number prefix.
+    """
+    stem = os.path.splitext(filename)[0]
+    prefix, _, word = stem.partition("_")
+    if not prefix.isdigit() or not word:
+        return None
+    return int(prefix), word.upper()
+
+def expected_words(name, js_path=WORD_LISTS_JS):
+    """[(i, w)] of LIST_<name> in wordLists.js, or None if there is no such list."""
+    if not os.path.exists(js_path):
+        return None
+    with open(js_path, encoding="utf-8") as f:
+        js = f.read()
+    match = re.search(rf'LIST_{re.escape(name)} = \[(.*?)\];', js, re.DOTALL)
+    if not match:
+        return None
+    return [(int(i), w) for i, w in re.findall(r'i:\s*(\d+),\s*w:\s*"([^"]+)"', match.group(1))]
+
+def list_filename(filename, expected):
+    """
+    The name a source recording takes in an app list folder. With
+    `expected` ([(i, w)] from expected_words), "03_Sick.wav" becomes
+    "23_sick.wav" after the word's number in that list, lower-cased like
+    the clips already there; None if the list has no such word. Without
+    `expected`, and for the intro, the name is kept.
+    """
+    parsed = parse_word_file(filename)
+    if expected is None or not parsed or parsed[0] == 0:
+        return filename
+    numbers = {w: i for i, w in expected}
+    if parsed[1] not in numbers:
+        return None
+    return f"{numbers[parsed[1]]:02d}_{parsed[1].lower()}.wav"
+
+def word_clip_files(list_dir, expected=None):
+    """
+    [(i, w, path)] of the word files in `list_dir`, by word number. The
+    intro (word 0) is never included. With `expected` ([(i, w)]), only
+    those words are taken and a missing one raises ValueError. Two files
+    for one word number (e.g. "01_check.wav" next to "01_Check.wav") also
+    raise, instead of both ending up in the sprite.
+    """
+    by_index = {}
+    for filename in sorted(os.listdir(list_dir)):
+        parsed = parse_word_file(filename) if filename.lower().endswith(".wav") else None
+        if not parsed or parsed[0] == 0:
+            continue
+        if expected is not None and parsed not in expected:
+            continue
+        if parsed[0] in by_index:
+            raise ValueError(
+                f"word {parsed[0]} has two files in {list_dir}: "
+                f"{os.path.basename(by_index[parsed[0]][2])} and {filename}"
+            )
+        by_index[parsed[0]] = parsed + (os.path.join(list_dir, filename),)
+
+    if expected is not None:
+        missing = [f"{i:02d}_{w}" for i, w in expected if i not in by_index]
+        if missing:
+            raise ValueError(f"{list_dir} is missing {', '.join(missing)}")
+    return [by_index[i] for i in sorted(by_index)]
+
+def build_sprite(list_dir, out_dir, name=None, gap_sec=GAP_SEC):
+    """
+    Packs the words of one list into <out_dir>/<name>.wav and writes
+    <name>.json with each word's sample offset and length, keyed by i/w.
+    When wordLists.js has LIST_<name>, exactly its words are packed;
+    otherwise every numbered wav except the intro. Samples are copied as
+    stored, so every word keeps its exact level. Returns the index dict.
+    """
+    name = name or os.path.basename(os.path.normpath(list_dir))
+    words = word_clip_files(list_dir, expected_words(name))
+    if not words:
+        raise ValueError(f"no numbered word files in {list_dir}")
+
+    clips = []
+    sr = None
+    for i, w, path in words:
+        rate, data = read_pcm(path)
+        if sr is None:
+            sr, layout = rate, (data.dtype, data.shape[1:])
+        elif (rate, (data.dtype, data.shape[1:])) != (sr, layout):
+            raise ValueError(f"{path} is {rate} Hz {data.dtype}{data.shape[1:]}, sprite is {sr} Hz {layout[0]}{layout[1]}")
+        clips.append((i, w, data))
+
+    return write_sprite(
+        out_dir, name, sr,
+        [({"i": i, "w": w}, data) for i, w, data in clips],
+        gap_sec,
+    )
+
+def write_sprite(out_dir, name, sr, clips, gap_sec=GAP_SEC, extra=None):
+    """
+    Writes <out_dir>/<name>.wav from `clips`, a list of (entry, samples)
+    with one shared dtype and channel layout, and <name>.json listing each
+    entry dict plus its "start" and "length" in samples. `extra` keys are
+    added to the top level of the index. Returns the index dict.
+    """
+    dtype, shape = clips[0][1].dtype, clips[0][1].shape[1:]
+    gap = np.zeros((int(round(gap_sec * sr)),) + shape, dtype=dtype)
+    if dtype == np.uint8:
+        gap += 128
+
+    index = {"file": f"{name}.wav", "sample_rate": sr}
+    index.update(extra or {})
+    index["words"] = []
+    parts = []
+    offset = 0
+    for entry, data in clips:
+        index["words"].append(dict(entry, start=offset, length=len(data)))
+        parts.extend([data, gap])
+        offset += len(data) + len(gap)
+
+    if not os.path.exists(out_dir):
+        os.makedirs(out_dir)
+    write_pcm(os.path.join(out_dir, f"{name}.wav"), sr, np.concatenate(parts[:-1]))
+    with open(os.path.join(out_dir, f"{name}.json"), "w") as f:
+        json.dump(index, f, indent=1)
+    return index
+
+def _sprite_job(job):
+    list_dir, out_dir = job
+    try:
+        return build_sprite(list_dir, out_dir), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+def build_sprites(list_dirs, out_dir, n_jobs=1):
+    """
+    One sprite per list folder, built on a process pool.
+    Returns [(list_dir, index or None, error or None)] in input order.
+    """
+    jobs = [(d, out_dir) for d in list_dirs]
+    if n_jobs > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            results = list(pool.map(_sprite_job, jobs))
+    else:
+        results = [_sprite_job(job) for job in jobs]
+    return [(d, index, error) for d, (index, error) in zip(list_dirs, results)]
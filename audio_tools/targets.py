@@ -0,0 +1,19 @@
+# Level targets (RMS dBFS) of the scripts that level files under audio/.
+# They import them from here, and audit_levels.py checks against the same
+# values, so a target cannot change in one place and not the other.
+
+# HF lists as prepare_assets.py builds them; generate_all_noise.py levels
+# the noise masters to match
+HF_SPEECH_DBFS = -23.0
+
+# App presentation level: scripts/normalize_hf3_hf4.py re-levels HF3/HF4
+# to it, prepare_assets_zero_ref.py builds HF1/HF2 at it
+APP_SPEECH_DBFS = -24.2
+
+# Calibration tones and noises (generate_cal_noise.py,
+# prepare_assets_zero_ref.py)
+CALIBRATION_DBFS = -23.0
+
+# NU-6 lists, as ffmpeg volumedetect mean volume (scripts/normalize_lists.py,
+# scripts/normalize_3a.py)
+NU6_MEAN_DB = -23.0
@@ -0,0 +1,199 @@
+import os
+import struct
+import wave
+
+import numpy as np
+import scipy.io.wavfile as wav
+
+# Full-scale value and DC offset of each integer PCM dtype scipy returns.
+# 24-bit files come back left-justified in int32, so they share its scale.
+PCM_FORMATS = {
+    np.dtype(np.uint8): (128.0, 128),
+    np.dtype(np.int16): (32768.0, 0),
+    np.dtype(np.int32): (2147483648.0, 0),
+}
+
+def read_pcm(path, mmap=False):
+    """
+    Returns (sample_rate, data) with the samples exactly as stored.
+    With mmap=True the data is a read-only view of the file on disk
+    (not available for 24-bit files).
+    """
+    return wav.read(path, mmap=mmap)
+
+# (format tag, bits per sample) -> dtype of one stored sample.
+# 24-bit samples are read as 3 raw bytes and unpacked by unpack_int24.
+WAV_DTYPES = {
+    (1, 8): np.dtype(np.uint8),
+    (1, 16): np.dtype('<i2'),
+    (1, 24): np.dtype(np.uint8),
+    (1, 32): np.dtype('<i4'),
+    (3, 32): np.dtype('<f4'),
+    (3, 64): np.dtype('<f8'),
+}
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+def map_wav(path):
+    """
+    Memory-maps the data chunk of a wav file without decoding or copying
+    it. Returns (sample_rate, frames): a read-only (n_frames, channels)
+    view for 8/16/32-bit and float files, or (n_frames, channels, 3) raw
+    bytes for 24-bit ones (see unpack_int24 / frames_to_float32).
+    """
+    with open(path, "rb") as f:
+        riff, _, wave_id = struct.unpack("<4sI4s", f.read(12))
+        if riff not in (b"RIFF", b"RF64") or wave_id != b"WAVE":
+            raise ValueError(f"{path} is not a RIFF/WAVE file")
+
+        fmt = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"{path} has no data chunk")
+            chunk_id, size = struct.unpack("<4sI", header)
+            if chunk_id == b"fmt ":
+                body = f.read(size)
+                tag, channels, sr, _, block_align, bits = struct.unpack("<HHIIHH", body[:16])
+                if tag == WAVE_FORMAT_EXTENSIBLE and size >= 26:
+                    # The real format code leads the SubFormat GUID
+                    tag = struct.unpack("<H", body[24:26])[0]
+                fmt = (tag, channels, sr, block_align, bits)
+            elif chunk_id == b"data":
+                offset = f.tell()
+                break
+            else:
+                f.seek(size, 1)
+            if size % 2:
+                f.seek(1, 1)
+
+    if fmt is None:
+        raise ValueError(f"{path} has no fmt chunk before its data")
+    tag, channels, sr, block_align, bits = fmt
+    if (tag, bits) not in WAV_DTYPES:
+        raise ValueError(f"{path}: unsupported wav format {tag} with {bits}-bit samples")
+
+    # Truncated files (or a 0xFFFFFFFF streaming size) end at end-of-file
+    n_frames = min(size, os.path.getsize(path) - offset) // block_align
+    shape = (n_frames, channels, 3) if bits == 24 else (n_frames, channels)
+    if n_frames == 0:
+        return sr, np.zeros(shape, dtype=WAV_DTYPES[(tag, bits)])
+    return sr, np.memmap(path, dtype=WAV_DTYPES[(tag, bits)], mode="r", offset=offset, shape=shape)
+
+def unpack_int24(raw):
+    """
+    (..., 3) little-endian 24-bit bytes -> int32, left-justified like
+    scipy's 24-bit reads so it shares the int32 full scale.
+    """
+    out = np.zeros(raw.shape[:-1] + (4,), dtype=np.uint8)
+    out[..., 1:] = raw
+    return out.view('<i4')[..., 0]
+
+def pack_int24(data):
+    """
+    Left-justified int32 samples (as read_pcm returns 24-bit files) ->
+    (..., 3) little-endian 24-bit bytes, rounded to the nearest 24-bit step.
+    """
+    wide = (data.astype(np.int64) + 128) >> 8
+    narrow = np.clip(wide, -(1 << 23), (1 << 23) - 1).astype('<i4')
+    return narrow[..., np.newaxis].view(np.uint8)[..., :3]
+
+def sample_width(path):
+    """Bytes per stored sample; 3 for 24-bit files, which read_pcm returns as int32."""
+    _, frames = map_wav(path)
+    return 3 if frames.ndim == 3 else frames.dtype.itemsize
+
+def frames_to_float32(frames):
+    """A block of map_wav frames as float32 in [-1.0, 1.0)."""
+    if frames.ndim == 3:
+        frames = unpack_int24(frames)
+    return to_float32(frames)
+
+def to_float32(data):
+    """
+    Converts PCM samples to float32 in [-1.0, 1.0), allocating only the
+    output array (no float64 intermediate).
+    """
+    if data.dtype == np.float32:
+        return data
+
+    out = np.empty(data.shape, dtype=np.float32)
+    if data.dtype.kind == 'f':
+        out[...] = data
+        return out
+
+    scale, offset = PCM_FORMATS[data.dtype]
+    if offset:
+        np.subtract(data, offset, out=out, dtype=np.float32, casting='unsafe')
+        out *= np.float32(1.0 / scale)
+    else:
+        np.multiply(data, np.float32(1.0 / scale), out=out, dtype=np.float32, casting='unsafe')
+    return out
+
+def to_mono(data):
+    if data.ndim > 1:
+        return data.mean(axis=1, dtype=np.float32)
+    return data
+
+def read_wav(path, mono=True, mmap=False):
+    """
+    Returns (sample_rate, float32 samples in [-1.0, 1.0)).
+    Stereo is averaged to mono unless mono=False, in which case the
+    (frames, channels) layout is kept.
+    """
+    sr, data = read_pcm(path, mmap=mmap)
+    data = to_float32(data)
+    if mono:
+        data = to_mono(data)
+    return sr, data
+
+def from_float32(data, dtype):
+    """
+    Converts float samples back to the integer PCM dtype they came from,
+    rounding and clipping to the format's range.
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind == 'f':
+        return data.astype(dtype)
+    scale, offset = PCM_FORMATS[dtype]
+    info = np.iinfo(dtype)
+    out = np.round(data * scale) + offset
+    return np.clip(out, info.min, info.max).astype(dtype)
+
+def write_pcm(path, sr, data, sample_width=None):
+    """
+    Writes samples as-is; the wav format follows data.dtype. With
+    sample_width=3, int32 data (left-justified, as read_pcm returns it) is
+    written back as 24-bit PCM.
+    """
+    if sample_width != 3:
+        wav.write(path, sr, data)
+        return
+    if data.dtype != np.int32:
+        raise ValueError(f"24-bit output needs int32 samples, got {data.dtype}")
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1 if data.ndim == 1 else data.shape[1])
+        w.setsampwidth(3)
+        w.setframerate(sr)
+        w.writeframes(np.ascontiguousarray(pack_int24(data)).tobytes())
+
+def write_wav(path, sr, data):
+    """Writes float samples as 16-bit PCM, clipping to avoid wrap-around."""
+    final_data = np.clip(data, -1.0, 1.0)
+    wav.write(path, sr, (final_data * 32767).astype(np.int16))
+
+def write_wav_stream(path, sr, blocks, gain=1.0):
+    """
+    Writes an iterable of float sample blocks as mono 16-bit PCM,
+    converting each block like write_wav. Only one block is in memory at
+    a time. Returns the number of frames written.
+    """
+    frames = 0
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sr)
+        for block in blocks:
+            block = np.clip(block * gain, -1.0, 1.0)
+            w.writeframes((block * 32767).astype("<i2").tobytes())
+            frames += len(block)
+    return frames
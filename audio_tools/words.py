@@ -0,0 +1,33 @@
+import os
+from glob import glob
+
+from audio_tools.segment import peak_trim_bounds
+
+# Words are trimmed to their loud part before their spectrum is taken
+# (generate_all_noise.py and the noise conformance check)
+SILENCE_THRESH_DB = -50.0
+TRIM_PARAMS = {"threshold_db": SILENCE_THRESH_DB}
+
+def list_word_files(list_dir):
+    """
+    The word recordings of one list folder, sorted: files whose name
+    starts with a digit, except the 00_Intro carrier recording.
+    """
+    return [
+        f for f in sorted(glob(os.path.join(list_dir, "*.wav")))
+        if os.path.basename(f)[0].isdigit() and not os.path.basename(f).startswith("00_Intro")
+    ]
+
+def trim_silence(data, threshold_db=SILENCE_THRESH_DB):
+    start, end = peak_trim_bounds(data, threshold_db)
+    return data[start:end]
+
+def trim_word(path, data, index=None):
+    """
+    `data` (the samples of `path`) cut to its "peak_trim" bounds, taken
+    from `index` (a BoundaryIndex) when it has them.
+    """
+    bounds = index.lookup(path, "peak_trim", TRIM_PARAMS) if index is not None else None
+    if bounds is None:
+        return trim_silence(data)
+    return data[bounds[0]:bounds[1]]
@@ -0,0 +1,150 @@
+import os
+import sys
+import csv
+import json
+import argparse
+from fnmatch import fnmatch
+from concurrent.futures import ProcessPoolExecutor
+
+from audio_tools.levels import meter_file
+from audio_tools.targets import HF_SPEECH_DBFS, APP_SPEECH_DBFS, CALIBRATION_DBFS, NU6_MEAN_DB
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+AUDIO_DIR = os.path.join(BASE_DIR, "audio")
+
+# Build outputs that are not list folders of their own
+SKIP_DIRS = {"sprites", "snr_bank"}
+
+# (pattern relative to audio/, RMS dBFS targets of the scripts that may
+# have written the file last). A file passes within tolerance of any of
+# them; an empty tuple means measured but deliberately not level-checked.
+# First match wins; a file matching none is flagged "no_target".
+TARGETS = [
+    # prepare_assets.py, or prepare_assets_zero_ref.py
+    ("HF1/*.wav", (HF_SPEECH_DBFS, APP_SPEECH_DBFS)),
+    ("HF2/*.wav", (HF_SPEECH_DBFS, APP_SPEECH_DBFS)),
+    # prepare_assets.py, then scripts/normalize_hf3_hf4.py
+    ("HF3/*.wav", (HF_SPEECH_DBFS, APP_SPEECH_DBFS)),
+    ("HF4/*.wav", (HF_SPEECH_DBFS, APP_SPEECH_DBFS)),
+    # NU-6 lists; scripts/split_list.py cuts 1A/2A but does not level them
+    ("[1-4]A/*.wav", (NU6_MEAN_DB,)),
+    # generate_all_noise.py, or prepare_assets_zero_ref.py
+    ("noise/*_MasterNoise.wav", (HF_SPEECH_DBFS, CALIBRATION_DBFS)),
+    ("calibration/000_Master_Calibration_1kHz.wav", (CALIBRATION_DBFS,)),
+    ("calibration/Global_HF_MasterNoise.wav", (HF_SPEECH_DBFS,)),
+    ("calibration/pink_noise_*_23dBFS.wav", (CALIBRATION_DBFS,)),
+    # Raw recordings prepare_assets.py reads, and List 4B as supplied
+    # (scripts/format_list4b.py)
+    ("Form_*/*.wav", ()),
+    ("HF4B/*.wav", ()),
+]
+TOLERANCE_DB = 0.5
+EXPECTED_SAMPLE_RATE = 44100
+
+COLUMNS = [
+    "file", "sample_rate", "bits", "format", "channels", "duration",
+    "rms_dbfs", "peak_dbfs", "clipped", "target_dbfs", "deviation_db", "flags",
+]
+
+def targets_for(relpath):
+    """The allowed targets of the first matching pattern, or None."""
+    for pattern, targets in TARGETS:
+        if fnmatch(relpath, pattern):
+            return targets
+    return None
+
+def collect_files(audio_dir):
+    """Every wav in each folder directly under audio_dir, in sorted order."""
+    files = []
+    for folder in sorted(os.listdir(audio_dir)):
+        folder_path = os.path.join(audio_dir, folder)
+        if folder.startswith(".") or folder in SKIP_DIRS or not os.path.isdir(folder_path):
+            continue
+        files.extend(
+            os.path.join(folder_path, f)
+            for f in sorted(os.listdir(folder_path)) if f.lower().endswith(".wav")
+        )
+    return files
+
+def audit_file(path, audio_dir=AUDIO_DIR):
+    """Measures one file and returns its report row (runs in a worker)."""
+    relpath = os.path.relpath(path, audio_dir).replace(os.sep, "/")
+    row = dict.fromkeys(COLUMNS)
+    row["file"] = relpath
+    try:
+        m = meter_file(path)
+    except Exception as e:
+        row["flags"] = f"error: {type(e).__name__}: {e}"
+        return row
+
+    flags = []
+    row.update({
+        "sample_rate": m["sample_rate"],
+        "bits": m["bits"],
+        "format": "float" if m["is_float"] else "pcm",
+        "channels": len(m["channels"]),
+        "duration": round(m["duration"], 3),
+        "rms_dbfs": round(float(m["dbfs"]), 2),
+        "peak_dbfs": round(float(m["peak_dbfs"]), 2),
+        "clipped": m["clipped"],
+    })
+    targets = targets_for(relpath)
+    if targets is None:
+        flags.append("no_target")
+    elif targets:
+        target = min(targets, key=lambda t: abs(float(m["dbfs"]) - t))
+        deviation = float(m["dbfs"]) - target
+        row["target_dbfs"] = target
+        row["deviation_db"] = round(deviation, 2)
+        if abs(deviation) > TOLERANCE_DB:
+            flags.append("level")
+    if m["clipped"]:
+        flags.append("clipping")
+    if m["sample_rate"] != EXPECTED_SAMPLE_RATE:
+        flags.append("sample_rate")
+    if m["frames"] == 0:
+        flags.append("empty")
+    row["flags"] = ";".join(flags)
+    return row
+
+def write_report(rows, path):
+    """CSV, or JSON when the path ends in .json."""
+    if path.lower().endswith(".json"):
+        with open(path, "w") as f:
+            json.dump(rows, f, indent=1)
+        return
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Audit the level and format of every wav under audio/.")
+    parser.add_argument("-o", "--output", default="audio_audit.csv", help="Report path (.csv or .json). Default: audio_audit.csv")
+    parser.add_argument("-j", "--jobs", type=int, default=0, help="Worker processes (0 = one per CPU core)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    n_jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    files = collect_files(AUDIO_DIR)
+    print(f"Auditing {len(files)} files with {n_jobs} worker(s)...")
+    if n_jobs > 1 and len(files) > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            rows = list(pool.map(audit_file, files, chunksize=16))
+    else:
+        rows = [audit_file(f) for f in files]
+
+    write_report(rows, args.output)
+    print(f"Report written to {args.output}")
+
+    flagged = [r for r in rows if r["flags"]]
+    for r in flagged:
+        print(f"   {r['file']}: {r['flags']} (rms {r['rms_dbfs']} dBFS, target {r['target_dbfs']})")
+    print(f"{len(rows) - len(flagged)}/{len(rows)} files OK.")
+    if flagged:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+import os
+import sys
+import argparse
+from glob import glob
+
+import numpy as np
+
+from audio_tools.psd import corpus_psd, segment_count
+from audio_tools.noise import FRAME_SIZE
+from audio_tools.psd_cache import PSDCache
+from audio_tools.bands import THIRD_OCTAVE_CENTERS, band_edges, psd_band_levels
+from audio_tools.boundaries import BoundaryIndex, INDEX_NAME
+from audio_tools.words import TRIM_PARAMS, list_word_files, trim_word
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+AUDIO_DIR = os.path.join(BASE_DIR, "audio")
+PSD_CACHE_DIR = os.path.join(BASE_DIR, ".cache", "psd")
+BOUNDARY_INDEX_PATH = os.path.join(AUDIO_DIR, INDEX_NAME)
+
+LISTS = ["HF1", "HF2", "HF3", "HF4"]
+# Both spectra are estimated at the resolution the generator itself used,
+# so the check sees the same smoothing the noise was shaped with:
+NPERSEG = FRAME_SIZE # generate_all_noise.py frames
+ROSE_HILL_NPERSEG = 1024 # scripts/generate_hf_noise.py, DEFAULT_NUMTAPS - 1
+CHECK_BANDS = [c for c in THIRD_OCTAVE_CENTERS if 125 <= c <= 8000]
+TOLERANCE_DB = 3.0
+# A band narrower than this many bins is a single smoothed point of the
+# spectrum, not a band level, and is left out of the comparison
+MIN_BAND_BINS = 2
+
+# How each generator averages its source speech; the reference must match:
+# "trimmed_frames" - generate_all_noise.py: words trimmed at -50 dB, every
+#                    analysis frame of the list weighted equally
+# "file_mean"      - scripts/generate_hf_noise.py: untrimmed files, every
+#                    file's spectrum weighted equally
+
+# Loaded lazily, once per (worker) process
+_boundary_index = None
+
+def boundary_index():
+    global _boundary_index
+    if _boundary_index is None:
+        _boundary_index = BoundaryIndex(BOUNDARY_INDEX_PATH)
+    return _boundary_index
+
+# Module-level so corpus_psd can ship it to worker processes
+def prep_trimmed(data, sr, path):
+    trimmed = trim_word(path, data, boundary_index())
+    return trimmed if len(trimmed) else None
+
+def conformance_pairs(audio_dir=AUDIO_DIR):
+    """
+    (label, noise wav, speech wavs it was generated from, reference kind,
+    nperseg) for every master that exists.
+    """
+    pairs = []
+    for name in LISTS:
+        noise = os.path.join(audio_dir, "noise", f"{name}_MasterNoise.wav")
+        words = list_word_files(os.path.join(audio_dir, name))
+        if os.path.exists(noise) and words:
+            pairs.append((name, noise, words, "trimmed_frames", NPERSEG))
+
+    # Global noise is built from every HF word (generate_all_noise.py)
+    global_noise = os.path.join(audio_dir, "calibration", "Global_HF_MasterNoise.wav")
+    all_words = [f for name in LISTS for f in list_word_files(os.path.join(audio_dir, name))]
+    if os.path.exists(global_noise) and all_words:
+        pairs.append(("Global HF", global_noise, all_words, "trimmed_frames", NPERSEG))
+
+    # scripts/generate_hf_noise.py averages every file in the HF folders
+    rose_hill = os.path.join(audio_dir, "Rose_Hill_Noise.wav")
+    hf_files = sorted(glob(os.path.join(audio_dir, "HF*", "*.wav")))
+    if os.path.exists(rose_hill) and hf_files:
+        pairs.append(("Rose Hill", rose_hill, hf_files, "file_mean", ROSE_HILL_NPERSEG))
+    return pairs
+
+def reference_psd(speech_paths, reference, cache=None, n_jobs=None, nperseg=NPERSEG):
+    """
+    Mean Welch PSD of the source speech, averaged the way its generator
+    averaged it. Returns (freqs, psd or None, fs).
+    """
+    if reference == "file_mean":
+        speech = corpus_psd(speech_paths, nperseg=nperseg, cache=cache, n_jobs=n_jobs)
+        return speech["freqs"], speech["mean"], speech["fs"]
+
+    speech = corpus_psd(
+        speech_paths, nperseg=nperseg, preprocess=prep_trimmed,
+        preprocess_params={"peak_trim": TRIM_PARAMS}, cache=cache, n_jobs=n_jobs
+    )
+    if not speech["paths"]:
+        return speech["freqs"], None, speech["fs"]
+
+    # The generator sums frame spectra over the whole list, so a longer
+    # word counts for more: weight each file by its number of frames.
+    # run_checks indexes the words first; anything it missed is trimmed here
+    index = boundary_index()
+    weights = []
+    for p in speech["paths"]:
+        start, end = index.get(p, "peak_trim", TRIM_PARAMS)
+        weights.append(segment_count(end - start, nperseg))
+    return speech["freqs"], np.average(speech["per_file"], axis=0, weights=weights), speech["fs"]
+
+def band_shape(freqs, psd, bands=CHECK_BANDS):
+    """
+    Band levels relative to their combined level, so only shape is
+    compared. Bands with fewer than MIN_BAND_BINS bins are nan.
+    """
+    levels = psd_band_levels(freqs, psd, bands)
+    lower, upper = band_edges(bands)
+    n_bins = np.searchsorted(freqs, upper) - np.searchsorted(freqs, lower)
+    levels[n_bins < MIN_BAND_BINS] = np.nan
+    return levels - 10 * np.log10(np.nansum(10 ** (levels / 10)))
+
+def check_pair(noise_path, speech_paths, reference="trimmed_frames", cache=None,
+               tolerance=TOLERANCE_DB, n_jobs=None, nperseg=NPERSEG):
+    """
+    Band-wise level difference (noise minus speech, dB) between a noise
+    master and the mean spectrum of its source words, both estimated with
+    `nperseg`-point segments. Bands too narrow to resolve are left out (nan).
+    Per-file Welch spectra come from `cache` when they were computed before.
+    Returns a dict with bands, diff, max_abs and ok.
+    """
+    freqs, speech_psd, fs = reference_psd(speech_paths, reference, cache, n_jobs, nperseg)
+    noise = corpus_psd([noise_path], nperseg=nperseg, resample_to=fs, cache=cache, n_jobs=1)
+    if speech_psd is None or noise["mean"] is None:
+        raise ValueError("no audio data to compare")
+
+    diff = band_shape(noise["freqs"], noise["mean"]) - band_shape(freqs, speech_psd)
+    if np.all(np.isnan(diff)):
+        raise ValueError(f"no band is resolved with {nperseg}-point segments")
+    max_abs = float(np.nanmax(np.abs(diff)))
+    return {"bands": CHECK_BANDS, "diff": diff, "max_abs": max_abs, "ok": max_abs <= tolerance}
+
+def run_checks(audio_dir=AUDIO_DIR, tolerance=TOLERANCE_DB, n_jobs=None, labels=None, nperseg=None):
+    """
+    Checks every pair (or only those named in `labels`), prints a report
+    and returns the labels that failed. `nperseg` ({label: segment length})
+    overrides the resolution of a pair, for a generator run with
+    non-default settings.
+    """
+    cache = PSDCache(PSD_CACHE_DIR)
+    cache.prune() # masters are rewritten on every generation run
+    pairs = [pair for pair in conformance_pairs(audio_dir) if labels is None or pair[0] in labels]
+    if not pairs:
+        print("No noise masters found to check.")
+        return []
+
+    # Trim bounds of the words come from the shared index, scanned once
+    words = sorted({w for _, _, paths, reference, _ in pairs if reference == "trimmed_frames" for w in paths})
+    errors = boundary_index().build(words, [("peak_trim", TRIM_PARAMS)], n_jobs)
+    for path, error in errors.items():
+        print(f"   Error: {path}: {error}")
+
+    print(f"Noise vs speech band levels (dB, noise - speech, tolerance +/-{tolerance:g} dB)")
+    print(f"{'Noise':<12}" + "".join(f"{c:>7}" for c in CHECK_BANDS) + "    max")
+    failed = []
+    for label, noise, words, reference, pair_nperseg in pairs:
+        if any(w in errors for w in words):
+            print(f"{label:<12} ERROR: could not read every word")
+            failed.append(label)
+            continue
+        try:
+            result = check_pair(
+                noise, words, reference, cache, tolerance, n_jobs,
+                (nperseg or {}).get(label, pair_nperseg)
+            )
+        except ValueError as e:
+            print(f"{label:<12} ERROR: {e}")
+            failed.append(label)
+            continue
+        status = "OK" if result["ok"] else "FAIL"
+        print(f"{label:<12}" + "".join(f"{d:7.1f}" for d in result["diff"]) + f"  {result['max_abs']:5.1f} {status}")
+        if not result["ok"]:
+            failed.append(label)
+    return failed
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that each noise master's spectrum matches its source speech.")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE_DB, help=f"Max per-band deviation in dB. Default: {TOLERANCE_DB}")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: one per core)")
+    args = parser.parse_args()
+
+    failed = run_checks(AUDIO_DIR, args.tolerance, args.jobs)
+    if failed:
+        print(f"\nConformance FAILED for: {', '.join(failed)}")
+        sys.exit(1)
+    print("\nAll noise masters conform.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import os
+import sys
+import argparse
+import tempfile
+
+import numpy as np
+
+from audio_tools.sprite import build_sprites, expected_words, word_clip_files
+from audio_tools.wavio import read_pcm
+from prepare_assets import AUDIO_DIR, SPRITE_LISTS
+
+def check_sprite(list_dir, index, sprite_dir):
+    """
+    Problems with one built sprite: words of the app's list it lacks, and
+    words whose slice of the sprite is not exactly their clip file.
+    """
+    name = os.path.basename(os.path.normpath(list_dir))
+    problems = []
+    expected = expected_words(name)
+    packed = [(e["i"], e["w"]) for e in index["words"]]
+    if expected is not None and packed != expected:
+        problems.append(f"packs {len(packed)} words, LIST_{name} has {len(expected)}")
+
+    _, sprite = read_pcm(os.path.join(sprite_dir, index["file"]))
+    clips = {(i, w): path for i, w, path in word_clip_files(list_dir, expected)}
+    for entry in index["words"]:
+        _, data = read_pcm(clips[(entry["i"], entry["w"])])
+        if not np.array_equal(sprite[entry["start"]:entry["start"] + entry["length"]], data):
+            problems.append(f"{entry['i']:02d}_{entry['w']} does not match its clip")
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description="Build every list sprite from audio/ (as prepare_assets.py --sprites does) into a scratch folder and check it.")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Worker processes. Default: 1")
+    args = parser.parse_args()
+
+    list_dirs = [os.path.join(AUDIO_DIR, name) for name in SPRITE_LISTS]
+    failed = []
+    with tempfile.TemporaryDirectory() as sprite_dir:
+        for list_dir in list_dirs:
+            if not os.path.isdir(list_dir):
+                print(f"Missing list folder: {list_dir}")
+                failed.append(list_dir)
+        found = [d for d in list_dirs if os.path.isdir(d)]
+        for list_dir, index, error in build_sprites(found, sprite_dir, args.jobs):
+            name = os.path.basename(list_dir)
+            problems = [error] if error else check_sprite(list_dir, index, sprite_dir)
+            if problems:
+                failed.append(list_dir)
+                for problem in problems:
+                    print(f"{name:<5} FAIL: {problem}")
+            else:
+                print(f"{name:<5} OK ({len(index['words'])} words)")
+
+    if failed:
+        print(f"\nSprite check FAILED for {len(failed)} list(s).")
+        sys.exit(1)
+    print("\nAll sprites build.")
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,16 @@
-import numpy as np
-from scipy.io import wavfile
-import math
+from audio_tools.levels import measure_file
 
 def calculate_dbfs(filepath):
     try:
-        sample_rate, data = wavfile.read(filepath)
-        
-        # Handle stereo/mono
-        if len(data.shape) > 1:
-            data = data[:, 0] # Use first channel
-            
-        # Convert to float to avoid overflow
-        data = data.astype(np.float64)
-        
-        # Calculate RMS
-        rms = np.sqrt(np.mean(data**2))
-        
-        # Calculate dBFS
-        # Assuming 16-bit audio, max magnitude is 32768
-        # Adjust based on bit depth if needed, but relative comparison holds
-        if data.dtype == np.int16:
-            max_val = 32768
-        elif data.dtype == np.int32:
-            max_val = 2147483648
-        elif data.dtype == np.uint8:
-            data = data - 128
-            max_val = 128
-        else:
-             max_val = 1.0 # Float 
-             
-        if rms > 0:
-            dbfs = 20 * np.log10(rms / max_val)
-        else:
-            dbfs = -float('inf')
-            
+        # Streamed through a memory map; first channel only, as before
+        level = measure_file(filepath, mono=False, channel=0)
         return {
             "file": filepath,
-            "rms": rms,
-            "dbfs": dbfs,
-            "max_val": max_val,
-            "sample_rate": sample_rate
+            "rms": level["rms"],
+            "dbfs": level["dbfs"],
+            "peak_dbfs": level["peak_dbfs"],
+            "crest_factor_db": level["crest_factor_db"],
+            "sample_rate": level["sample_rate"]
         }
     except Exception as e:
         return {"file": filepath, "error": str(e)}
@@ -54,16 +25,16 @@ results = []
 for f in files:
     results.append(calculate_dbfs(f))
 
-print(f"{'File':<50} | {'RMS':<15} | {'dBFS':<10}")
-print("-" * 85)
+print(f"{'File':<50} | {'RMS':<15} | {'dBFS':<10} | {'Peak dBFS':<10} | {'Crest dB':<10}")
+print("-" * 111)
 
 for r in results:
     if "error" in r:
         print(f"{r['file']:<50} | Error: {r['error']}")
     else:
-        print(f"{r['file']:<50} | {r['rms']:<15.4f} | {r['dbfs']:<10.2f}")
+        print(f"{r['file']:<50} | {r['rms']:<15.4f} | {r['dbfs']:<10.2f} | {r['peak_dbfs']:<10.2f} | {r['crest_factor_db']:<10.2f}")
 
 if len(results) == 2 and "dbfs" in results[0] and "dbfs" in results[1]:
     diff = abs(results[0]["dbfs"] - results[1]["dbfs"])
-    print("-" * 85)
+    print("-" * 111)
     print(f"Difference: {diff:.2f} dB")
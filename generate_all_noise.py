@@ -1,7 +1,13 @@
 import os
+import sys
+import argparse
 import numpy as np
-import scipy.io.wavfile as wav
-from glob import glob
+
+from audio_tools.wavio import read_wav, write_wav
+from audio_tools.noise import FRAME_SIZE, accumulate_power_spectrum, synthesize_noise, synthesize_loop
+from audio_tools.words import TRIM_PARAMS, list_word_files, trim_word
+from audio_tools.boundaries import BoundaryIndex, INDEX_NAME
+from audio_tools.targets import HF_SPEECH_DBFS
 
 # Configuration
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -9,43 +15,9 @@ AUDIO_DIR = os.path.join(BASE_DIR, "audio")
 NOISE_OUTPUT_DIR = os.path.join(AUDIO_DIR, "noise")
 
 LISTS = ["HF1", "HF2", "HF3", "HF4"]
-TARGET_SPEECH_DBFS = -23.0 # Matches our normalization target
-SILENCE_THRESH_DB = -50.0
-
-def read_wav(path):
-    try:
-        sr, data = wav.read(path)
-    except Exception as e:
-        print(f"Error reading {path}: {e}")
-        return 0, np.array([])
-    
-    # Normalize to -1.0 to 1.0 float
-    if data.dtype == np.int16: data = data / 32768.0
-    elif data.dtype == np.int32: data = data / 2147483648.0
-    elif data.dtype == np.uint8: data = (data - 128) / 128.0
-    
-    # Convert stereo to mono
-    if len(data.shape) > 1: data = np.mean(data, axis=1)
-    
-    return sr, data.astype(np.float32)
-
-def write_wav(path, sr, data):
-    # Clip to avoid wrapping
-    final_data = np.clip(data, -1.0, 1.0)
-    wav.write(path, sr, (final_data * 32767).astype(np.int16))
-
-def trim_silence(data, threshold_db):
-    rms = np.sqrt(np.mean(data**2))
-    if rms == 0: return data
-    curr_db = 20 * np.log10(rms)
-    if curr_db < threshold_db: return np.array([])
-
-    abs_data = np.abs(data)
-    thresh = 10**(threshold_db/20)
-    mask = abs_data > thresh
-    indices = np.where(mask)[0]
-    if len(indices) == 0: return data
-    return data[indices[0]:indices[-1]]
+TARGET_SPEECH_DBFS = HF_SPEECH_DBFS # Matches our normalization target
+NOISE_DURATION_SEC = 30.0 # Length of each generated master noise
+BOUNDARY_INDEX_PATH = os.path.join(AUDIO_DIR, INDEX_NAME)
 
 def set_rms(data, target_db):
     rms = np.sqrt(np.mean(data**2))
@@ -54,72 +26,114 @@ def set_rms(data, target_db):
     gain = 10**((target_db - current_db) / 20)
     return data * gain
 
-def generate_ssn(file_list):
-    print(f"  > Generating Master Noise from {len(file_list)} target words...")
-    all_audio = []
+def word_spectrum(file_list, index=None):
+    """
+    Reads and trims each word once and returns (power_sum, n_frames, sr):
+    the summed frame power spectra, ready to be combined across lists.
+    Trim bounds are taken from `index` (a BoundaryIndex) when it has them.
+    """
+    power_sum = None
+    n_frames = 0
     sr_ref = 44100
     
     for f in file_list:
-        sr, audio = read_wav(f)
-        if sr == 0: continue
+        try:
+            sr, audio = read_wav(f)
+        except Exception as e:
+            print(f"Error reading {f}: {e}")
+            continue
         sr_ref = sr
         # Trim silence to ensure steady-state spectral density
-        trimmed = trim_silence(audio, SILENCE_THRESH_DB)
+        trimmed = trim_word(f, audio, index)
         if len(trimmed) > 0:
-            all_audio.append(trimmed)
+            # Long-term spectrum from fixed-size frames; nothing is concatenated
+            power, frames = accumulate_power_spectrum(trimmed, FRAME_SIZE)
+            power_sum = power if power_sum is None else power_sum + power
+            n_frames += frames
 
-    if not all_audio:
+    return power_sum, n_frames, sr_ref
+
+def ssn_from_spectrum(power_sum, n_frames, sr, duration_sec=NOISE_DURATION_SEC, loop=False):
+    if n_frames == 0:
         print("    No audio data found!")
-        return None, sr_ref
+        return None
 
-    concat_speech = np.concatenate(all_audio)
-    
-    # FFT
-    fft_speech = np.fft.rfft(concat_speech)
-    
-    # Randomize Phases
-    phases = np.exp(2j * np.pi * np.random.rand(len(fft_speech)))
-    noise_fft = np.abs(fft_speech) * phases
-    
-    # Inverse FFT
-    ssn = np.fft.irfft(noise_fft)
-    
-    return ssn, sr_ref
+    # Random-phase overlap-add at the averaged magnitude spectrum.
+    # Output length is independent of how much speech went in.
+    # With loop=True the buffer is synthesized circularly instead, so it
+    # can be looped end-to-start without a click.
+    magnitude = np.sqrt(power_sum / n_frames)
+    if loop:
+        return synthesize_loop(magnitude, int(duration_sec * sr))
+    return synthesize_noise(magnitude, int(duration_sec * sr), FRAME_SIZE)
+
+def generate_ssn(file_list, duration_sec=NOISE_DURATION_SEC, loop=False):
+    power_sum, n_frames, sr = word_spectrum(file_list)
+    return ssn_from_spectrum(power_sum, n_frames, sr, duration_sec, loop), sr
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate speech-shaped master noise for each HF list.")
+    parser.add_argument(
+        "--loop", type=float, metavar="SECONDS",
+        help="Write short, seamlessly looping noise of this length instead of "
+             f"{NOISE_DURATION_SEC:g} s of overlap-add noise"
+    )
+    parser.add_argument(
+        "--check", action="store_true",
+        help="Afterwards, compare each noise's band spectrum with its words and exit 1 on a mismatch"
+    )
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+    loop = args.loop is not None
+    duration_sec = args.loop if loop else NOISE_DURATION_SEC
+
     if not os.path.exists(NOISE_OUTPUT_DIR):
         os.makedirs(NOISE_OUTPUT_DIR)
 
+    # Per-list spectra are summed into the global one, so each word file
+    # is decoded and trimmed exactly once
+    global_power = None
+    global_frames = 0
+    global_words = 0
+    sr_global = 44100
+
+    # Trim bounds for every list are scanned up front, in parallel, and
+    # reused from the boundary index on later runs
+    list_files = {
+        name: list_word_files(os.path.join(AUDIO_DIR, name))
+        for name in LISTS if os.path.exists(os.path.join(AUDIO_DIR, name))
+    }
+    index = BoundaryIndex(BOUNDARY_INDEX_PATH)
+    all_files = [f for files in list_files.values() for f in files]
+    index.build(all_files, [("peak_trim", TRIM_PARAMS)])
+
     for list_name in LISTS:
         list_dir = os.path.join(AUDIO_DIR, list_name)
-        if not os.path.exists(list_dir):
+        if list_name not in list_files:
             print(f"Directory not found: {list_dir}")
             continue
             
         print(f"\nProcessing {list_name}...")
-        
-        # Get all wav files in the list directory
-        # We assume files are already normalized and trimmed from previous step
-        wav_files = sorted(glob(os.path.join(list_dir, "*.wav")))
-        
-        # Filter for words (usually start with digits)
-        word_files = []
-        for f in wav_files:
-            fname = os.path.basename(f)
-            # Simple check: starts with digit or is intro
-            # Actually, standardizing on words only is best for speech spectrum
-            if fname[0].isdigit() and not fname.startswith("00_Intro"):
-                word_files.append(f)
+        word_files = list_files[list_name]
         
         if not word_files:
             print(f"  No word files found in {list_dir}")
             continue
             
         # Generate SSN
-        noise_data, sr = generate_ssn(word_files)
+        print(f"  > Generating Master Noise from {len(word_files)} target words...")
+        power_sum, n_frames, sr = word_spectrum(word_files, index)
+        noise_data = ssn_from_spectrum(power_sum, n_frames, sr, duration_sec, loop)
         
         if noise_data is not None:
-             # Normalize noise to match target speech level
+            global_power = power_sum if global_power is None else global_power + power_sum
+            global_frames += n_frames
+            global_words += len(word_files)
+            sr_global = sr
+
+            # Normalize noise to match target speech level
             noise_norm = set_rms(noise_data, TARGET_SPEECH_DBFS)
             
             output_filename = f"{list_name}_MasterNoise.wav"
@@ -129,34 +143,29 @@ def main():
             print(f"  Saved: {output_path}")
 
     # --- Global Noise Generation ---
-    print("\nGenerating Global HF Master Noise (from all 100 words)...")
-    all_global_words = []
-    
-    for list_name in LISTS:
-        list_dir = os.path.join(AUDIO_DIR, list_name)
-        if not os.path.exists(list_dir): continue
-        wav_files = sorted(glob(os.path.join(list_dir, "*.wav")))
-        for f in wav_files:
-            fname = os.path.basename(f)
-            if fname[0].isdigit() and not fname.startswith("00_Intro"):
-                all_global_words.append(f)
-    
-    if all_global_words:
-        global_noise_data, sr = generate_ssn(all_global_words)
-        if global_noise_data is not None:
-            # Normalize
-            global_noise_norm = set_rms(global_noise_data, TARGET_SPEECH_DBFS)
+    print(f"\nGenerating Global HF Master Noise (from all {global_words} words)...")
+    if global_frames:
+        global_noise_data = ssn_from_spectrum(global_power, global_frames, sr_global, duration_sec, loop)
+        # Normalize
+        global_noise_norm = set_rms(global_noise_data, TARGET_SPEECH_DBFS)
+        
+        # Ensure calibration dir exists
+        cal_dir = os.path.join(AUDIO_DIR, "calibration")
+        if not os.path.exists(cal_dir):
+            os.makedirs(cal_dir)
             
-            # Ensure calibration dir exists
-            cal_dir = os.path.join(AUDIO_DIR, "calibration")
-            if not os.path.exists(cal_dir):
-                os.makedirs(cal_dir)
-                
-            output_path = os.path.join(cal_dir, "Global_HF_MasterNoise.wav")
-            write_wav(output_path, sr, global_noise_norm)
-            print(f"  Saved Global Calibration Noise: {output_path}")
+        output_path = os.path.join(cal_dir, "Global_HF_MasterNoise.wav")
+        write_wav(output_path, sr_global, global_noise_norm)
+        print(f"  Saved Global Calibration Noise: {output_path}")
 
     print("\nAll noise files generated.")
 
+    if args.check:
+        # Imported here: the check pulls in the PSD cache and pool machinery
+        from check_noise_conformance import run_checks
+        print()
+        if run_checks(AUDIO_DIR):
+            sys.exit(1)
+
 if __name__ == "__main__":
     main()
@@ -1,17 +1,33 @@
 import numpy as np
 import scipy.signal as signal
-from scipy.io import wavfile
 import subprocess
+import argparse
 import re
 import os
 
-def generate_pink_noise(samples):
-    white = np.random.randn(samples)
-    X = np.fft.rfft(white)
-    f = np.fft.rfftfreq(samples)
-    f[0] = f[1]
-    X /= np.sqrt(f)
-    return np.fft.irfft(X, n=samples)
+from audio_tools.noise import pink_sos, filtered_noise_blocks
+from audio_tools.wavio import write_wav_stream
+from audio_tools.targets import CALIBRATION_DBFS
+
+BAND_HZ = (4000, 12000)
+TARGET_DBFS = CALIBRATION_DBFS
+
+def cal_noise_sos(sr, band=BAND_HZ):
+    # Pinking filter followed by the band-pass, as one cascade
+    nyq = 0.5 * sr
+    bandpass = signal.butter(8, [band[0] / nyq, band[1] / nyq], btype='bandpass', output='sos')
+    return np.vstack([pink_sos(), bandpass])
+
+def stream_stats(blocks):
+    """(rms, peak) of a block stream, without keeping it in memory."""
+    sum_sq = 0.0
+    n = 0
+    peak = 0.0
+    for block in blocks:
+        sum_sq += float(np.dot(block, block))
+        n += len(block)
+        peak = max(peak, float(np.max(np.abs(block))))
+    return np.sqrt(sum_sq / n), peak
 
 def check_volume(filepath):
     cmd = [
@@ -30,38 +46,38 @@ def check_volume(filepath):
         return float(mean_match.group(1)), float(max_match.group(1))
     return None, None
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate band-limited pink calibration noise.")
+    parser.add_argument("--duration", type=float, default=60, help="Length in seconds. Default: 60")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed (default: random)")
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
     sr = 44100
-    duration = 60 # seconds
-    samples = int(sr * duration)
-    
-    print("Generating pink noise...")
-    pink = generate_pink_noise(samples)
-    
-    print("Filtering 4000 Hz to 12000 Hz...")
-    nyq = 0.5 * sr
-    low = 4000 / nyq
-    high = 12000 / nyq
-    sos = signal.butter(8, [low, high], btype='bandpass', output='sos')
-    filtered = signal.sosfilt(sos, pink)
+    samples = int(sr * args.duration)
+
+    # The noise is streamed twice from the same seed: once to measure
+    # its level, once to write it scaled, so memory stays constant
+    seed = args.seed if args.seed is not None else np.random.SeedSequence().entropy
+    sos = cal_noise_sos(sr)
     
-    print("Normalizing to -23 dBFS...")
-    current_rms = np.sqrt(np.mean(filtered**2))
-    target_rms = 10**(-23.0 / 20.0)
+    print(f"Generating {args.duration:g} s of pink noise, filtered {BAND_HZ[0]} Hz to {BAND_HZ[1]} Hz (seed {seed})...")
+    current_rms, current_peak = stream_stats(filtered_noise_blocks(samples, sos, seed))
     
-    normalized = filtered * (target_rms / current_rms)
+    print(f"Normalizing to {TARGET_DBFS:g} dBFS...")
+    target_rms = 10**(TARGET_DBFS / 20.0)
+    gain = target_rms / current_rms
     
-    max_amp = np.max(np.abs(normalized))
+    max_amp = current_peak * gain
     print(f"Max peak amplitude after normalization: {max_amp:.4f} (must be < 1.0)")
     if max_amp >= 1.0:
         print("WARNING: Peak amplitude exceeds 1.0. Clipping will occur.")
         
-    # Convert to 16-bit PCM
-    int_signal = np.int16(normalized * 32767)
-    
+    # Written as 16-bit PCM, block by block
     out_file = "pink_noise_4kHz_12kHz_cal_23dBFS.wav"
     out_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), out_file)
-    wavfile.write(out_path, sr, int_signal)
+    write_wav_stream(out_path, sr, filtered_noise_blocks(samples, sos, seed), gain)
     print(f"Saved to {out_path}")
     
     print("Verifying with ffmpeg volumedetect...")
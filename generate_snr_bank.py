@@ -0,0 +1,176 @@
+import os
+import sys
+import argparse
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+from audio_tools.wavio import read_wav, read_pcm, from_float32, to_float32
+from audio_tools.export import EXPORT_FORMATS, encode, decode
+from audio_tools.levels import dbfs
+from audio_tools.manifest import file_digest
+from audio_tools.sprite import parse_word_file, write_sprite
+from audio_tools.words import list_word_files
+from generate_all_noise import AUDIO_DIR, NOISE_OUTPUT_DIR, LISTS, set_rms
+
+# Configuration
+BANK_DIR = os.path.join(AUDIO_DIR, "snr_bank")
+DEFAULT_SNRS = [-5.0, 0.0, 5.0, 10.0, 15.0, 20.0]
+NOISE_LEAD_SEC = 0.5 # noise before the word onset
+NOISE_TAIL_SEC = 0.25 # noise after the word ends
+DEFAULT_SEED = 20240601
+SNR_TOLERANCE_DB = 0.05
+# Bank container: lossless FLAC (about half the size of the wav), or plain wav
+BANK_FORMATS = ["flac", "wav"]
+
+def noise_segment(noise, n_samples, rng):
+    # Random start, never past the end: the masters are not circular, so
+    # wrapping around would splice a click into the token
+    if n_samples > len(noise):
+        raise ValueError(f"word with padding is {n_samples} samples, master noise only {len(noise)}")
+    start = int(rng.integers(len(noise) - n_samples + 1))
+    return noise[start:start + n_samples]
+
+def mix_word(job):
+    """
+    Renders one word against its list's master noise at every SNR.
+    The noise segment position comes from (seed, list, word number), so a
+    rerun produces identical samples. The SNR is measured on the int16
+    samples that are stored: the noise part is the stored mix minus the
+    word, the speech part is the stored mix minus the masker, so rounding
+    and clipping both count. Returns (job, mixes, error) where mixes is a
+    list of (entry, int16 samples).
+    """
+    list_name, word_path, noise_path, snrs, seed = job
+    try:
+        i, w = parse_word_file(os.path.basename(word_path))
+        sr, speech = read_wav(word_path)
+        noise_sr, noise = read_wav(noise_path)
+        if noise_sr != sr:
+            raise ValueError(f"noise is {noise_sr} Hz, word is {sr} Hz")
+
+        lead = int(round(NOISE_LEAD_SEC * sr))
+        tail = int(round(NOISE_TAIL_SEC * sr))
+        speech_db = dbfs(speech)
+        padded = np.concatenate([np.zeros(lead), speech, np.zeros(tail)])
+
+        rng = np.random.default_rng([seed, LISTS.index(list_name), i])
+        segment = noise_segment(noise, len(padded), rng)
+
+        mixes = []
+        for snr in snrs:
+            masker = set_rms(segment, speech_db - snr)
+            mix = from_float32(padded + masker, np.int16)
+
+            # Verify the level actually reached in the stored samples, and that nothing clips
+            stored = to_float32(mix).astype(np.float64)
+            speech_part = (stored - masker)[lead:lead + len(speech)]
+            noise_db = dbfs(stored - padded)
+            achieved = dbfs(speech_part) - noise_db
+            if abs(achieved - snr) > SNR_TOLERANCE_DB:
+                return job, None, f"{w} at {snr:+g} dB: achieved SNR {achieved:.3f} dB"
+            peak = int(np.max(np.abs(mix.astype(np.int32))))
+            if peak >= 32767:
+                return job, None, f"{w} at {snr:+g} dB clips (peak {peak})"
+
+            entry = {"i": i, "w": w, "snr": snr, "speech_dbfs": round(dbfs(speech_part), 2),
+                     "noise_dbfs": round(noise_db, 2), "onset": lead}
+            mixes.append((entry, mix))
+    except Exception as e:
+        return job, None, f"{type(e).__name__}: {e}"
+    return job, mixes, None
+
+def store_flac(wav_path):
+    """
+    Encodes the bank wav to FLAC next to it and removes the wav once the
+    FLAC decodes to exactly the same samples. Returns the FLAC path.
+    """
+    flac_path = os.path.splitext(wav_path)[0] + EXPORT_FORMATS["flac"]["ext"]
+    _, samples = read_pcm(wav_path)
+    encode(wav_path, flac_path, "flac")
+    if not np.array_equal(decode(flac_path, "s16le", "<i2"), samples.ravel()):
+        raise ValueError(f"{flac_path} does not decode to the rendered samples")
+    os.remove(wav_path)
+    return flac_path
+
+def build_list_bank(list_name, snrs, seed, n_jobs=1, out_dir=BANK_DIR, fmt="flac"):
+    """
+    Mixes every word of one HF list at every SNR and writes
+    <out_dir>/<list>.flac (or .wav) plus <list>.json, indexed by i/w/snr.
+    Returns (index or None, [(word_path, error)]).
+    """
+    word_files = list_word_files(os.path.join(AUDIO_DIR, list_name))
+    noise_path = os.path.join(NOISE_OUTPUT_DIR, f"{list_name}_MasterNoise.wav")
+    if not word_files:
+        return None, [(list_name, "no word files")]
+    if not os.path.exists(noise_path):
+        return None, [(noise_path, "master noise not found (run generate_all_noise.py)")]
+
+    jobs = [(list_name, f, noise_path, snrs, seed) for f in word_files]
+    if n_jobs > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            results = list(pool.map(mix_word, jobs, chunksize=2))
+    else:
+        results = [mix_word(job) for job in jobs]
+
+    failures = [(job[1], error) for job, _, error in results if error]
+    if failures:
+        return None, failures
+
+    clips = [mix for _, mixes, _ in results for mix in mixes]
+    sr, _ = read_wav(word_files[0])
+    extra = {
+        "list": list_name,
+        "seed": seed,
+        "snrs": snrs,
+        "noise": os.path.basename(noise_path),
+        "noise_sha256": file_digest(noise_path),
+    }
+    if fmt == "flac":
+        extra["file"] = f"{list_name}.flac"
+    index = write_sprite(out_dir, list_name, sr, clips, extra=extra)
+    if fmt == "flac":
+        try:
+            store_flac(os.path.join(out_dir, f"{list_name}.wav"))
+        except subprocess.CalledProcessError as e:
+            return None, [(list_name, f"ffmpeg failed: {e.stderr.decode(errors='replace').strip()}")]
+        except ValueError as e:
+            return None, [(list_name, str(e))]
+
+    # Drop a bank left over from a run in the other format
+    for other in BANK_FORMATS:
+        stale = os.path.join(out_dir, f"{list_name}.{other}")
+        if other != fmt and os.path.exists(stale):
+            os.remove(stale)
+    return index, []
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Render every HF word at a set of SNRs against its master noise.")
+    parser.add_argument("--snr", type=float, action="append", help=f"SNR in dB (repeatable). Default: {DEFAULT_SNRS}")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed for the noise segment positions")
+    parser.add_argument("--lists", nargs="+", default=LISTS, choices=LISTS, help="Lists to render (default: all)")
+    parser.add_argument("--format", choices=BANK_FORMATS, default="flac", help="Bank container (default: flac, lossless)")
+    parser.add_argument("-j", "--jobs", type=int, default=0, help="Worker processes (0 = one per CPU core)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    snrs = sorted(args.snr) if args.snr else DEFAULT_SNRS
+    n_jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    failed = False
+    for list_name in args.lists:
+        print(f"\nRendering {list_name} at {', '.join(f'{s:+g}' for s in snrs)} dB SNR...")
+        index, failures = build_list_bank(list_name, snrs, args.seed, n_jobs, fmt=args.format)
+        if failures:
+            failed = True
+            for path, error in failures:
+                print(f"   Error: {path}: {error}")
+            continue
+        print(f"  Saved {len(index['words'])} mixes to {os.path.join(BANK_DIR, index['file'])}")
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
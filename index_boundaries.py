@@ -0,0 +1,54 @@
+import os
+import sys
+import argparse
+from glob import glob
+
+from audio_tools.boundaries import BoundaryIndex, INDEX_NAME
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+AUDIO_DIR = os.path.join(BASE_DIR, "audio")
+
+# (folder glob under audio/, boundary kind, params) for each tool that
+# reads the index. Params must match the tool's own, or it will miss.
+REQUESTS = [
+    ("Form_*", "chunk_trim", {"silence_threshold": -50.0, "chunk_size": 10}),  # prepare_assets
+    ("HF*", "peak_trim", {"threshold_db": -50.0}),                             # generate_all_noise
+    ("[1-4][A-D]", "target_word",                                              # plot_spectral_density
+     {"env_window": 0.05, "rel_thresh": 0.1, "min_len": 0.1, "padding": 0.05}),
+    ("NU-6", "silences", {"noise_db": -50.0, "min_silence": 0.5}),             # split_list
+]
+
+def collect(audio_dir):
+    """Returns {wav path: [(kind, params), ...]} for the whole tree."""
+    wanted = {}
+    for pattern, kind, params in REQUESTS:
+        for path in sorted(glob(os.path.join(audio_dir, pattern, "*.wav"))):
+            wanted.setdefault(path, []).append((kind, params))
+    return wanted
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the shared word-boundary index for audio/.")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: one per core)")
+    args = parser.parse_args()
+
+    index = BoundaryIndex(os.path.join(AUDIO_DIR, INDEX_NAME))
+    wanted = collect(AUDIO_DIR)
+
+    # One build per distinct request set, so each file is decoded once
+    groups = {}
+    for path, requests in wanted.items():
+        key = tuple(kind for kind, _ in requests)
+        groups.setdefault(key, ([], requests))[0].append(path)
+
+    errors = {}
+    for paths, requests in groups.values():
+        errors.update(index.build(paths, requests, args.jobs))
+
+    print(f"Indexed {len(wanted) - len(errors)}/{len(wanted)} files into {index.path}")
+    if errors:
+        for path, error in errors.items():
+            print(f"   {path}: {error}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,18 @@
 import os
+import sys
 import shutil
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 from pydub import AudioSegment
 
+from audio_tools.manifest import BuildManifest
+from audio_tools.segment import silence_bounds
+from audio_tools.boundaries import BoundaryIndex, INDEX_NAME
+from audio_tools.export import EXPORT_FORMATS, export_step
+from audio_tools.sprite import build_sprites, expected_words, list_filename
+from audio_tools.targets import HF_SPEECH_DBFS
+
 # Configuration
 # Mapping of Source Directory -> Target Directory
 # (relative to this script's location)
@@ -15,26 +26,60 @@ FORM_MAPPING = {
     "Form_4": "HF4"
 }
 
-TARGET_DBFS = -23.0
+TARGET_DBFS = HF_SPEECH_DBFS
+SILENCE_THRESHOLD_DB = -50.0
+CHUNK_SIZE_MS = 10
+
+# Everything that affects the output bytes; a change invalidates the manifest
+BUILD_PARAMS = {
+    "target_dbfs": TARGET_DBFS,
+    "silence_threshold": SILENCE_THRESHOLD_DB,
+    "chunk_size": CHUNK_SIZE_MS,
+}
+
+# Key of the trim bounds in the shared boundary index
+TRIM_PARAMS = {"silence_threshold": SILENCE_THRESHOLD_DB, "chunk_size": CHUNK_SIZE_MS}
+BOUNDARY_INDEX_PATH = os.path.join(AUDIO_DIR, INDEX_NAME)
+
+# Lists packed into one sprite each by --sprites: the HF forms built
+# here plus the NU-6 lists
+SPRITE_LISTS = list(FORM_MAPPING.values()) + ["1A", "2A", "3A", "4A"]
+SPRITE_DIR = os.path.join(AUDIO_DIR, "sprites")
+
+# Shipped alongside the words; exported as-is and checked against their own level
+EXTRA_EXPORT_DIRS = ["noise", "calibration"]
+
+# pydub sample_width -> numpy dtype of the raw frame data
+SAMPLE_DTYPES = {1: np.uint8, 2: np.int16, 4: np.int32}
 
 def match_target_amplitude(sound, target_dBFS):
     change_in_dBFS = target_dBFS - sound.dBFS
     return sound.apply_gain(change_in_dBFS)
 
-def trim_silence(sound, silence_threshold=-50.0, chunk_size=10):
-    # Detect leading silence
-    trim_start = 0
-    while trim_start < len(sound) and sound[trim_start:trim_start+chunk_size].dBFS < silence_threshold:
-        trim_start += chunk_size
+def trim_silence(sound, silence_threshold=SILENCE_THRESHOLD_DB, chunk_size=CHUNK_SIZE_MS, bounds=None):
+    if bounds is not None:
+        return sound.get_sample_slice(*bounds)
 
-    # Detect trailing silence
-    trim_end = len(sound)
-    while trim_end > trim_start and sound[trim_end-chunk_size:trim_end].dBFS < silence_threshold:
-        trim_end -= chunk_size
-        
-    return sound[trim_start:trim_end]
+    samples = np.frombuffer(sound.raw_data, dtype=SAMPLE_DTYPES[sound.sample_width])
+    samples = samples.reshape(-1, sound.channels)
+    if sound.sample_width == 1:
+        # 8-bit wav is unsigned
+        samples = samples.astype(np.int16) - 128
 
-def process_folder(input_dir, output_dir):
+    start, end = silence_bounds(
+        samples, sound.frame_rate, silence_threshold, chunk_size,
+        max_amplitude=sound.max_possible_amplitude
+    )
+    return sound.get_sample_slice(start, end)
+
+def collect_folder_jobs(input_dir, output_dir, expected=None):
+    """
+    Returns the (filename, input_path, output_path) jobs for one form folder,
+    in sorted filename order. With `expected` (the list's [(i, w)] from
+    wordLists.js) outputs are named by the word's number in the app's list
+    (see sprite.list_filename), and words the list lacks are skipped, so
+    the form's own numbering never leaves a second file for a word number.
+    """
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
         print(f"Created output folder: {output_dir}")
@@ -42,8 +87,9 @@ def process_folder(input_dir, output_dir):
     # Process Speech Files
     if not os.path.exists(input_dir):
         print(f"Skipping missing input folder: {input_dir}")
-        return
+        return []
 
+    jobs = []
     files = sorted([f for f in os.listdir(input_dir) if f.endswith(".wav")])
     for filename in files:
         # Filter Logic - we want numbered files and Intro
@@ -64,39 +110,207 @@ def process_folder(input_dir, output_dir):
             print(f"Skipping non-speech file: {filename}")
             continue
 
+        output_name = list_filename(filename, expected)
+        if output_name is None:
+            print(f"Skipping {filename}: not in the {os.path.basename(output_dir)} word list")
+            continue
+
         input_path = os.path.join(input_dir, filename)
-        output_path = os.path.join(output_dir, filename)
+        output_path = os.path.join(output_dir, output_name)
+        jobs.append((filename, input_path, output_path))
+
+    return jobs
+
+def process_file(job, bounds=None):
+    """
+    Trims and normalizes a single file. Runs in a worker process when
+    --jobs > 1, so it returns (job, error) instead of printing.
+    `bounds` are the indexed trim bounds; computed here when missing.
+    """
+    filename, input_path, output_path = job
+    try:
+        audio = AudioSegment.from_file(input_path)
         
-        print(f"Processing: {filename} -> {os.path.basename(output_dir)}")
-        try:
-            audio = AudioSegment.from_file(input_path)
-            
-            # 1. Trim Silence FIRST
-            # We want the active speech to be at the target level.
-            # Trimming does not change the amplitude of samples, just duration.
-            trimmed_audio = trim_silence(audio)
-
-            # 2. Normalize trimmed audio
-            # Now RMS calculation is based mostly on speech energy.
-            normalized_audio = match_target_amplitude(trimmed_audio, TARGET_DBFS)
-            
-            normalized_audio.export(output_path, format="wav")
-            # print(f"   Saved: {output_path}")
-            
-        except Exception as e:
-            print(f"   Error processing {filename}: {e}")
+        # 1. Trim Silence FIRST
+        # We want the active speech to be at the target level.
+        # Trimming does not change the amplitude of samples, just duration.
+        trimmed_audio = trim_silence(audio, bounds=bounds)
+
+        # 2. Normalize trimmed audio
+        # Now RMS calculation is based mostly on speech energy.
+        normalized_audio = match_target_amplitude(trimmed_audio, TARGET_DBFS)
+        
+        normalized_audio.export(output_path, format="wav")
+    except Exception as e:
+        return job, f"{type(e).__name__}: {e}"
+    return job, None
+
+def run_jobs(jobs, n_jobs=1, bounds=None):
+    """
+    Runs process_file over `jobs`, serially or on a process pool.
+    Results come back in the same order as `jobs` either way.
+    `bounds` maps input paths to their trim bounds from the boundary index.
+    """
+    bounds = bounds or {}
+    job_bounds = [bounds.get(job[1]) for job in jobs]
+    if n_jobs > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            results = pool.map(process_file, jobs, job_bounds, chunksize=4)
+            for job, error in results:
+                report_result(job, error)
+                yield job, error
+    else:
+        for job, b in zip(jobs, job_bounds):
+            job, error = process_file(job, b)
+            report_result(job, error)
+            yield job, error
+
+def report_result(job, error):
+    filename, _, output_path = job
+    print(f"Processing: {filename} -> {os.path.basename(os.path.dirname(output_path))}")
+    if error:
+        print(f"   Error processing {filename}: {error}")
+
+def process_folder(input_dir, output_dir, n_jobs=1):
+    jobs = collect_folder_jobs(input_dir, output_dir, expected_words(os.path.basename(output_dir)))
+    return list(run_jobs(jobs, n_jobs))
+
+def remove_stale_outputs(manifest, jobs):
+    """
+    Deletes files an earlier build recorded as outputs that no job writes
+    any more (e.g. "HF1/03_Voice.wav" from before outputs were named after
+    the app's lists), so they cannot end up next to the current clips.
+    Folders no job wrote to this run (missing sources) are left alone.
+    """
+    outputs = [job[2] for job in jobs if os.path.exists(job[2])]
+    folders = {os.path.dirname(os.path.abspath(job[2])) for job in jobs}
+    for path in manifest.stale_outputs(job[2] for job in jobs):
+        if os.path.dirname(path) not in folders or not os.path.exists(path):
+            continue
+        # On a case-insensitive disk "01_Check.wav" may be today's "01_check.wav"
+        if not any(os.path.samefile(path, out) for out in outputs):
+            os.remove(path)
+            print(f"Removed stale output: {os.path.relpath(path, AUDIO_DIR)}")
+
+def build_list_sprites(n_jobs=1):
+    """
+    Packs each list folder into audio/sprites/<list>.wav + <list>.json.
+    Returns [(list_dir, error)] for lists that failed.
+    """
+    list_dirs = [os.path.join(AUDIO_DIR, name) for name in SPRITE_LISTS]
+    failures = []
+    for list_dir, index, error in build_sprites([d for d in list_dirs if os.path.isdir(d)], SPRITE_DIR, n_jobs):
+        if error:
+            failures.append((list_dir, error))
+        else:
+            print(f"Sprite: {index['file']} ({len(index['words'])} words)")
+    return failures
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Trim and normalize the Rose Hill HF forms.")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1,
+        help="Number of worker processes (0 = one per CPU core). Default: 1"
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="Rebuild every file, even if the build manifest says it is up to date"
+    )
+    parser.add_argument(
+        "--export", action="append", choices=sorted(EXPORT_FORMATS), default=[],
+        help="Also write this compressed variant of every output, noise and "
+             "calibration file and update audio/assets.json (repeatable)"
+    )
+    parser.add_argument(
+        "--sprites", action="store_true",
+        help="Also pack each list into one audio/sprites/<list>.wav with a JSON offset index"
+    )
+    return parser.parse_args()
+
+def export_jobs(jobs, manifest):
+    """
+    (wav, expected dBFS) for every normalized output plus the extra dirs.
+    Outputs a later step re-levelled are checked against their own level.
+    """
+    wavs = [
+        (job[2], None if manifest.rewritten_later(job[2]) else TARGET_DBFS)
+        for job in jobs if os.path.exists(job[2])
+    ]
+    for name in EXTRA_EXPORT_DIRS + ["sprites"]:
+        folder = os.path.join(AUDIO_DIR, name)
+        if os.path.isdir(folder):
+            wavs.extend(
+                (os.path.join(folder, f), None)
+                for f in sorted(os.listdir(folder)) if f.endswith(".wav")
+            )
+    return wavs
 
 def main():
+    args = parse_args()
+    n_jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
     print("Starting normalization of Rose Hill HF Forms...")
     
+    # Gather every form first so a single pool spans all four folders
+    jobs = []
     for src_name, dst_name in FORM_MAPPING.items():
         src_path = os.path.join(AUDIO_DIR, src_name)
         dst_path = os.path.join(AUDIO_DIR, dst_name)
         
-        print(f"\nProcessing {src_name} -> {dst_name}")
-        process_folder(src_path, dst_path)
-        
-    print("\nNormalization complete.")
+        print(f"\nCollecting {src_name} -> {dst_name}")
+        jobs.extend(collect_folder_jobs(src_path, dst_path, expected_words(dst_name)))
+
+    # Skip outputs whose source and parameters are unchanged since the last build
+    # scripts/normalize_hf3_hf4.py re-levels HF3/HF4 in place afterwards;
+    # its output of an up-to-date file is not a reason to rebuild it
+    manifest = BuildManifest(AUDIO_DIR, "prepare_assets", later_steps=["normalize_hf3_hf4"])
+    if not args.force:
+        stale = [job for job in jobs if not manifest.is_fresh(job[1], job[2], BUILD_PARAMS)]
+        print(f"\n{len(jobs) - len(stale)} files up to date.")
+    else:
+        stale = jobs
+
+    # Trim bounds come from the shared index; only new sources are scanned
+    index = BoundaryIndex(BOUNDARY_INDEX_PATH)
+    sources = [job[1] for job in stale]
+    index.build(sources, [("chunk_trim", TRIM_PARAMS)], n_jobs)
+    bounds = {}
+    for path in sources:
+        b = index.lookup(path, "chunk_trim", TRIM_PARAMS)
+        if b is not None:
+            bounds[path] = b
+
+    print(f"Processing {len(stale)} files with {n_jobs} worker(s)...")
+    failures = []
+    for job, error in run_jobs(stale, n_jobs, bounds):
+        if error:
+            failures.append((job, error))
+        else:
+            manifest.record(job[1], job[2], BUILD_PARAMS)
+    remove_stale_outputs(manifest, jobs)
+    manifest.save()
+
+    print(f"\nNormalization complete. {len(stale) - len(failures)}/{len(stale)} files processed.")
+
+    if args.sprites:
+        print("\nBuilding list sprites...")
+        failures.extend(
+            ((os.path.basename(list_dir), list_dir, None), error)
+            for list_dir, error in build_list_sprites(n_jobs)
+        )
+
+    if args.export:
+        print(f"\nExporting {', '.join(args.export)} variants...")
+        failures.extend(
+            ((os.path.basename(src), src, None), error)
+            for src, error in export_step(AUDIO_DIR, export_jobs(jobs, manifest), args.export, n_jobs)
+        )
+
+    if failures:
+        print(f"{len(failures)} file(s) failed:")
+        for (filename, input_path, _), error in failures:
+            print(f"   {input_path}: {error}")
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
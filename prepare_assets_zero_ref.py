@@ -1,21 +1,30 @@
 import os
-import shutil
 import subprocess
 import sys
+import argparse
+
+from audio_tools.manifest import BuildManifest
+from audio_tools.targets import APP_SPEECH_DBFS, CALIBRATION_DBFS
+from audio_tools.wavio import read_pcm, write_pcm
+from audio_tools import boundaries
+from audio_tools.export import EXPORT_FORMATS, export_step
+from audio_tools.sprite import expected_words, list_filename
 
 # Configuration
 SRC_BASE = "/home/marks/Development/Rose Hill HF Word Lists"
 APP_AUDIO_BASE = "/home/marks/Development/nu6-phoneme-scorer/audio"
 
 # Constants
-TARGET_DBFS_SPEECH = -24.2
-TARGET_DBFS_TONE = -23.0
+TARGET_DBFS_SPEECH = APP_SPEECH_DBFS
+TARGET_DBFS_TONE = CALIBRATION_DBFS
 SILENCE_THRESHOLD_DB = -50
+# Same detection as the ffmpeg silenceremove chain this replaced: RMS over a 20 ms window
+SILENCE_WINDOW_SEC = 0.02
+TRIM_PARAMS = {"threshold_db": SILENCE_THRESHOLD_DB, "window": SILENCE_WINDOW_SEC}
 
 # Paths to tools
 # We use the ffmpeg-normalize installed in the local venv
 FFMPEG_NORMALIZE_BIN = "./audio_env/bin/ffmpeg-normalize"
-FFMPEG_BIN = "ffmpeg" # System ffmpeg
 
 def ensure_dir(path):
     if not os.path.exists(path):
@@ -45,47 +54,59 @@ def normalize_file(src, dest, target_db):
         return False
     return True
 
-def trim_silence(src_dest_path):
+def trim_silence(src_dest_path, index=None):
     """
-    Trims silence from start and end of the file in-place (technically via tmp file).
-    Uses ffmpeg silenceremove + reverse method.
+    Trims silence from start and end of the file in-place (via tmp file).
+    Keeps the region whose 20 ms running RMS is above SILENCE_THRESHOLD_DB,
+    like the ffmpeg silenceremove + areverse chain used before; the cut
+    points can still differ from ffmpeg's by a few milliseconds, as ffmpeg
+    does not centre its window. Bounds come from the shared boundary index
+    (computed and stored if new). A file with no window above the
+    threshold is left untrimmed rather than emptied.
     """
     tmp_path = src_dest_path + ".tmp.wav"
-    
-    # Filter explanation:
-    # 1. silenceremove=start_periods=1:start_duration=0:start_threshold=-50dB  (Trim Start)
-    # 2. areverse (Reverse audio)
-    # 3. silenceremove=start_periods=1:start_duration=0:start_threshold=-50dB  (Trim End, which is now Start)
-    # 4. areverse (Restore normal order)
-    
-    filter_chain = (
-        f"silenceremove=start_periods=1:start_duration=0:start_threshold={SILENCE_THRESHOLD_DB}dB,"
-        "areverse,"
-        f"silenceremove=start_periods=1:start_duration=0:start_threshold={SILENCE_THRESHOLD_DB}dB,"
-        "areverse"
-    )
-
-    cmd = [
-        FFMPEG_BIN,
-        "-y", # overwrite
-        "-i", src_dest_path,
-        "-af", filter_chain,
-        tmp_path
-    ]
-
     try:
-        subprocess.check_call(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        shutil.move(tmp_path, src_dest_path)
-        # print(f"   [TRIM] {os.path.basename(src_dest_path)}")
-    except subprocess.CalledProcessError as e:
+        if index is None:
+            start, end = boundaries.compute(src_dest_path, [("rms_trim", TRIM_PARAMS)])[0]
+        else:
+            start, end = index.get(src_dest_path, "rms_trim", TRIM_PARAMS)
+        if end <= start:
+            print(f"   WARNING: {os.path.basename(src_dest_path)} is below {SILENCE_THRESHOLD_DB} dB throughout; not trimmed")
+            return True
+        sr, raw = read_pcm(src_dest_path)
+        if (start, end) == (0, len(raw)):
+            return True
+        write_pcm(tmp_path, sr, raw[start:end])
+        os.replace(tmp_path, src_dest_path)
+    except (OSError, ValueError) as e:
         print(f"   ERROR trimming {src_dest_path}: {e}")
         if os.path.exists(tmp_path):
             os.remove(tmp_path)
+        return False
+    return True
+
+def build_params(target_db, do_trim):
+    params = {"target_db": target_db, "do_trim": do_trim}
+    if do_trim:
+        params["silence_threshold"] = SILENCE_THRESHOLD_DB
+        params["trim"] = "rms"
+        params["silence_window"] = SILENCE_WINDOW_SEC
+    return params
 
-def process_pipeline(src, dest, target_db, do_trim=False):
+def process_pipeline(src, dest, target_db, do_trim=False, manifest=None, index=None, outputs=None):
     if not os.path.exists(src):
         return
 
+    # Export checks levels against the target, except for trimmed speech
+    # whose RMS moved when the silence was cut (checked against its wav)
+    if outputs is not None:
+        outputs.append((dest, None if do_trim else target_db))
+
+    params = build_params(target_db, do_trim)
+    if manifest is not None and manifest.is_fresh(src, dest, params):
+        print(f"Up to date: {os.path.basename(src)}")
+        return
+
     print(f"Processing: {os.path.basename(src)}")
     
     # 1. Normalize
@@ -95,13 +116,25 @@ def process_pipeline(src, dest, target_db, do_trim=False):
 
     # 2. Trim (if needed) - Modifies dest in-place
     if do_trim:
-        trim_silence(dest)
+        if not trim_silence(dest, index):
+            return
         print(f"   -> Reference: {target_db} dB | Trimmed: Yes")
     else:
         print(f"   -> Reference: {target_db} dB | Trimmed: No")
 
+    if manifest is not None:
+        manifest.record(src, dest, params)
+
 
 def main():
+    parser = argparse.ArgumentParser(description="Normalize the Rose Hill sources into the app audio folder.")
+    parser.add_argument("--force", action="store_true", help="Ignore the build manifest and rebuild everything")
+    parser.add_argument(
+        "--export", action="append", choices=sorted(EXPORT_FORMATS), default=[],
+        help="Also write this compressed variant of every output and update assets.json (repeatable)"
+    )
+    args = parser.parse_args()
+
     # Verify tools
     if not os.path.exists(FFMPEG_NORMALIZE_BIN):
         print(f"ERROR: ffmpeg-normalize not found at {FFMPEG_NORMALIZE_BIN}")
@@ -117,13 +150,19 @@ def main():
     for d in [dest_calibration, dest_noise, dest_hf1, dest_hf2]:
         ensure_dir(d)
 
+    manifest = BuildManifest(APP_AUDIO_BASE, "prepare_assets_zero_ref")
+    if args.force:
+        manifest.entries.clear()
+    index = boundaries.BoundaryIndex(os.path.join(APP_AUDIO_BASE, boundaries.INDEX_NAME))
+    outputs = []
+
     # ---------------------------
     # 1. CALIBRATION (Tone)
     # ---------------------------
     cal_src = os.path.join(SRC_BASE, "000_Master_Calibration_1kHz.wav")
     cal_dest = os.path.join(dest_calibration, "000_Master_Calibration_1kHz.wav")
     print(f"\n--- Calibration ---")
-    process_pipeline(cal_src, cal_dest, TARGET_DBFS_TONE, do_trim=False)
+    process_pipeline(cal_src, cal_dest, TARGET_DBFS_TONE, do_trim=False, manifest=manifest, outputs=outputs)
 
     # ---------------------------
     # 2. FORM 1 (Speech & Noise)
@@ -145,14 +184,18 @@ def main():
                 if prefix.isdigit() and 1 <= int(prefix) <= 25:
                     is_speech = True
             
-            if is_speech:
+            # Named after the word's number in the app's HF1 list
+            output_name = list_filename(filename, expected_words("HF1"))
+            if is_speech and output_name is None:
+                print(f"Skipping {filename}: not in the HF1 word list")
+            elif is_speech:
                 src = os.path.join(src_form1, filename)
-                dest = os.path.join(dest_hf1, filename)
-                process_pipeline(src, dest, TARGET_DBFS_SPEECH, do_trim=True)
+                dest = os.path.join(dest_hf1, output_name)
+                process_pipeline(src, dest, TARGET_DBFS_SPEECH, do_trim=True, manifest=manifest, index=index, outputs=outputs)
 
     noise_src_f1 = os.path.join(src_form1, "Form_1_Python_MasterNoise.wav")
     noise_dest_f1 = os.path.join(dest_noise, "HF1_MasterNoise.wav")
-    process_pipeline(noise_src_f1, noise_dest_f1, TARGET_DBFS_TONE, do_trim=False)
+    process_pipeline(noise_src_f1, noise_dest_f1, TARGET_DBFS_TONE, do_trim=False, manifest=manifest, outputs=outputs)
 
     # ---------------------------
     # 3. FORM 2 (Speech & Noise)
@@ -174,14 +217,29 @@ def main():
                 if prefix.isdigit() and 1 <= int(prefix) <= 25:
                     is_speech = True
             
-            if is_speech:
+            output_name = list_filename(filename, expected_words("HF2"))
+            if is_speech and output_name is None:
+                print(f"Skipping {filename}: not in the HF2 word list")
+            elif is_speech:
                 src = os.path.join(src_form2, filename)
-                dest = os.path.join(dest_hf2, filename)
-                process_pipeline(src, dest, TARGET_DBFS_SPEECH, do_trim=True)
+                dest = os.path.join(dest_hf2, output_name)
+                process_pipeline(src, dest, TARGET_DBFS_SPEECH, do_trim=True, manifest=manifest, index=index, outputs=outputs)
 
     noise_src_f2 = os.path.join(src_form2, "Form_2_Python_MasterNoise.wav")
     noise_dest_f2 = os.path.join(dest_noise, "HF2_MasterNoise.wav")
-    process_pipeline(noise_src_f2, noise_dest_f2, TARGET_DBFS_TONE, do_trim=False)
+    process_pipeline(noise_src_f2, noise_dest_f2, TARGET_DBFS_TONE, do_trim=False, manifest=manifest, outputs=outputs)
+
+    manifest.save()
+    index.save()
+
+    if args.export:
+        print(f"\n--- Export ({', '.join(args.export)}) ---")
+        wavs = [(dest, target_db) for dest, target_db in outputs if os.path.exists(dest)]
+        failures = export_step(APP_AUDIO_BASE, wavs, args.export, n_jobs=os.cpu_count() or 1)
+        for path, error in failures:
+            print(f"   ERROR exporting {path}: {error}")
+        if failures:
+            sys.exit(1)
 
 if __name__ == "__main__":
     main()
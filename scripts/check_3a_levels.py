@@ -1,8 +1,10 @@
-
 import os
-import subprocess
-import math
-import re
+import sys
+
+# Shared helpers live in audio_tools/ at the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from audio_tools.wavio import read_wav
+from audio_tools.levels import mean_volume_db
 
 # Configuration
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -11,25 +13,15 @@ DIR_HF3 = os.path.join(BASE_DIR, "audio", "HF3") # Reference
 
 def get_rms_db(filepath):
     """
-    Calculates RMS dBFS using ffmpeg correctly.
+    Calculates the level ffmpeg volumedetect reports as mean_volume,
+    in-process on the decoded samples (all channels pooled).
     """
-    # ffmpeg -i input -filter:a volumedetect -f null /dev/null
-    cmd = [
-        "ffmpeg",
-        "-i", filepath,
-        "-filter:a", "volumedetect",
-        "-f", "null",
-        "-"
-    ]
-    
-    result = subprocess.run(cmd, stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, text=True)
-    output = result.stderr
-    
-    # Parse mean_volume: -25.5 dB
-    match = re.search(r"mean_volume: ([\-\d\.]+) dB", output)
-    if match:
-        return float(match.group(1))
-    return None
+    try:
+        _, data = read_wav(filepath, mono=False)
+    except Exception as e:
+        print(f"({e})", end=" ", flush=True)
+        return None
+    return mean_volume_db(data)
 
 def analyze_folder(folder_path, name):
     if not os.path.exists(folder_path):
@@ -1,47 +1,24 @@
 
 import os
-import math
-import wave
-import struct
 import sys
 
-def calculate_dbfs(file_path):
+# Shared helpers live in audio_tools/ at the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from audio_tools.levels import meter_file
+
+def meter(file_path):
+    """Per-channel and pooled levels (any PCM/float wav), or None on error."""
     try:
-        with wave.open(file_path, 'rb') as wav_file:
-            width = wav_file.getsampwidth()
-            channels = wav_file.getnchannels()
-            frames = wav_file.readframes(wav_file.getnframes())
-            
-            # Manual RMS calculation
-            # Convert bytes to integers based on width
-            if width == 2: # 16-bit
-                fmt = f"<{len(frames)//2}h"
-                samples = struct.unpack(fmt, frames)
-            elif width == 1: # 8-bit
-                fmt = f"<{len(frames)}B"
-                # 8-bit is unsigned 0-255, center at 128
-                samples = [s - 128 for s in struct.unpack(fmt, frames)]
-            elif width == 3: # 24-bit (less common, more complex to unpack)
-                 # Skip for now or assume 16-bit for this app
-                 return None
-            else:
-                 return None
-            
-            sum_squares = sum(s**2 for s in samples)
-            rms = math.sqrt(sum_squares / len(samples))
-            
-            if rms == 0:
-                return -float('inf')
-                
-            # Calculate dBFS
-            # Max amplitude for N bits is 2^(N*8 - 1)
-            max_amp = 2**(width*8 - 1)
-            dbfs = 20 * math.log10(rms / max_amp)
-            return dbfs
+        return meter_file(file_path)
     except Exception as e:
         print(f"Error reading {file_path}: {e}")
         return None
 
+def calculate_dbfs(file_path):
+    # All channels pooled, matching a plain RMS over the interleaved frames
+    levels = meter(file_path)
+    return levels["dbfs"] if levels else None
+
 def analyze_directory(directory):
     if not os.path.exists(directory):
         print(f"Directory not found: {directory}")
@@ -59,12 +36,15 @@ def analyze_directory(directory):
     count = 0
     min_dbfs = float('inf')
     max_dbfs = -float('inf')
+    max_peak = -float('inf')
 
     for f in files:
         path = os.path.join(directory, f)
-        dbfs = calculate_dbfs(path)
-        if dbfs is not None:
-            # print(f"{f}: {dbfs:.2f} dBFS")
+        levels = meter(path)
+        if levels is not None:
+            dbfs = levels["dbfs"]
+            # print(f"{f}: {dbfs:.2f} dBFS, per channel " + ", ".join(f"{c['dbfs']:.2f}" for c in levels["channels"]))
+            max_peak = max(max_peak, levels["peak_dbfs"])
             total_dbfs += dbfs
             count += 1
             if dbfs < min_dbfs: min_dbfs = dbfs
@@ -75,6 +55,7 @@ def analyze_directory(directory):
         print(f"Files: {count}")
         print(f"Average Level: {avg_dbfs:.2f} dBFS")
         print(f"Range: {min_dbfs:.2f} dBFS to {max_dbfs:.2f} dBFS")
+        print(f"Highest Peak: {max_peak:.2f} dBFS")
     else:
         print("No valid audio data found.")
 
@@ -1,61 +1,67 @@
 import os
+import sys
 import numpy as np
 import scipy.io.wavfile as wav
 import scipy.signal as signal
 import glob
+import argparse
 
-def compute_average_spectrum(file_paths):
-    psd_sum = None
-    count = 0
-    fs = None
+# Shared helpers live in audio_tools/ at the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from audio_tools.psd import corpus_psd
+from audio_tools.noise import synthesize_loop
+
+# Shaping filter length. Must be odd (firwin2 needs a type I filter
+# when the target has gain at Nyquist). The spectrum is estimated with
+# numtaps - 1 point segments, so longer = finer spectral detail.
+DEFAULT_NUMTAPS = 1025
+
+def compute_average_spectrum(file_paths, numtaps=DEFAULT_NUMTAPS, resample_to=None):
+    """
+    Mean Welch PSD over all files, computed in batches on a process pool.
+    The segment length is numtaps - 1, which gives numtaps // 2 + 1
+    frequency points: as many as a numtaps filter can resolve. Files at
+    different sample rates raise ValueError unless resample_to is given.
+    """
+    result = corpus_psd(file_paths, nperseg=numtaps - 1, resample_to=resample_to)
+    for fp in result["skipped"]:
+        print(f"Skipped {fp}: no audio data")
+    return result["fs"], result["mean"]
+
+def shaping_filter(target_psd, numtaps=DEFAULT_NUMTAPS):
+    # Frequency-sampling FIR design; target magnitude response is sqrt(PSD)
+    target_mag = np.sqrt(target_psd)
     
-    for fp in file_paths:
-        try:
-            rate, data = wav.read(fp)
-            if fs is None: fs = rate
-            if rate != fs: continue # Skip mix-matched sample rates
-            
-            # Normalize to -1.0 to 1.0
-            if data.dtype == np.int16:
-                data = data.astype(np.float32) / 32768.0
-            elif data.dtype == np.int32:
-                data = data.astype(np.float32) / 2147483648.0
-                
-            # Compute PSD
-            f, Pxx = signal.welch(data, fs, nperseg=1024)
-            
-            if psd_sum is None:
-                psd_sum = np.zeros_like(Pxx)
-            
-            if len(Pxx) == len(psd_sum):
-                psd_sum += Pxx
-                count += 1
-        except Exception as e:
-            print(f"Error processing {fp}: {e}")
-            
-    return fs, psd_sum / count if count > 0 else None
+    # Valid frequency points for firwin2 (0.0 to 1.0 where 1.0 is Nyquist)
+    freqs = np.linspace(0, 1, len(target_mag))
+    
+    return signal.firwin2(numtaps, freqs, target_mag)
 
-def generate_noise_from_spectrum(target_psd, fs, duration_sec=30):
+def generate_noise_from_spectrum(target_psd, fs, duration_sec=30, numtaps=DEFAULT_NUMTAPS, method="fft"):
+    """
+    White noise shaped by a `numtaps` FIR matching target_psd.
+    method="fft" filters by overlap-add FFT convolution, whose cost barely
+    depends on numtaps; method="direct" is the original lfilter, which
+    gives the same samples (to rounding) at O(n * numtaps).
+    """
     n_samples = int(fs * duration_sec)
     
     # Generate white noise
     white_noise = np.random.normal(0, 1, n_samples)
     
-    # Filter white noise to match target PSD
-    # We'll use an FIR filter design method based on frequency sampling
-    # Target magnitude response is sqrt(PSD)
-    target_mag = np.sqrt(target_psd)
-    
-    # Create valid frequency points for firwin2 (0.0 to 1.0 where 1.0 is Nyquist)
-    freqs = np.linspace(0, 1, len(target_mag))
-    
-    # Design filter (arbitrary number of taps, e.g., 513)
-    taps = signal.firwin2(1025, freqs, target_mag)
+    taps = shaping_filter(target_psd, numtaps)
     
-    # Apply filter
-    shaped_noise = signal.lfilter(taps, 1.0, white_noise)
-    
-    return shaped_noise
+    # Apply filter; lfilter output is the full convolution cut to the input length
+    if method == "direct":
+        return signal.lfilter(taps, 1.0, white_noise)
+    return signal.oaconvolve(white_noise, taps)[:n_samples]
+
+def generate_loop_from_spectrum(target_psd, fs, duration_sec):
+    """
+    Noise that loops seamlessly, with exactly the target spectrum at this
+    length (circular frequency-domain synthesis, no filter).
+    """
+    return synthesize_loop(np.sqrt(target_psd), int(fs * duration_sec))
 
 def normalize_audio(data, target_rms_db=-23.0):
     current_rms = np.sqrt(np.mean(data**2))
@@ -70,7 +76,32 @@ def save_wav(filename, rate, data):
     data_int16 = (data * 32767).astype(np.int16)
     wav.write(filename, rate, data_int16)
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate speech-shaped noise from the HF word lists.")
+    parser.add_argument(
+        "--taps", type=int, default=DEFAULT_NUMTAPS,
+        help=f"Shaping filter length (odd). Default: {DEFAULT_NUMTAPS}"
+    )
+    parser.add_argument(
+        "--direct", action="store_true",
+        help="Filter with direct-form lfilter instead of FFT convolution (slow for long filters)"
+    )
+    parser.add_argument(
+        "--loop", type=float, metavar="SECONDS",
+        help="Write a short, seamlessly looping noise of this length instead of 60 s of filtered noise"
+    )
+    parser.add_argument(
+        "--check", action="store_true",
+        help="Afterwards, compare the noise's band spectrum with the HF words and exit 1 on a mismatch"
+    )
+    args = parser.parse_args()
+    if args.taps < 3 or args.taps % 2 == 0:
+        parser.error("--taps must be an odd number >= 3")
+    return args
+
 def main():
+    args = parse_args()
+
     # 1. Find all HF list files
     hf_files = glob.glob("audio/HF*/*.wav")
     print(f"Found {len(hf_files)} HF audio files.")
@@ -81,7 +112,11 @@ def main():
 
     # 2. Compute Spectrum
     print("Computing average spectrum...")
-    fs, avg_psd = compute_average_spectrum(hf_files)
+    try:
+        fs, avg_psd = compute_average_spectrum(hf_files, args.taps)
+    except ValueError as e:
+        print(f"Failed to compute spectrum: {e}")
+        return
     
     if avg_psd is None:
         print("Failed to compute spectrum.")
@@ -89,7 +124,13 @@ def main():
         
     # 3. Generate Noise
     print("Generating noise...")
-    noise = generate_noise_from_spectrum(avg_psd, fs, duration_sec=60) # 60 seconds loop
+    if args.loop is not None:
+        noise = generate_loop_from_spectrum(avg_psd, fs, args.loop)
+    else:
+        noise = generate_noise_from_spectrum(
+            avg_psd, fs, duration_sec=60, # 60 seconds loop
+            numtaps=args.taps, method="direct" if args.direct else "fft"
+        )
     
     # 4. Normalize
     print("Normalizing to -23.0 dB RMS...")
@@ -100,5 +141,12 @@ def main():
     save_wav(output_path, fs, noise)
     print(f"Saved generated noise to {output_path}")
 
+    if args.check:
+        # Imported here: the check pulls in the PSD cache and pool machinery
+        from check_noise_conformance import run_checks
+        print()
+        if run_checks(labels=["Rose Hill"], nperseg={"Rose Hill": args.taps - 1}):
+            sys.exit(1)
+
 if __name__ == "__main__":
     main()
@@ -2,12 +2,18 @@ import os
 import shutil
 import subprocess
 import sys
+import argparse
+
+# Shared helpers live in audio_tools/ at the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from audio_tools.manifest import BuildManifest, file_digest
+from audio_tools.targets import APP_SPEECH_DBFS
 
 # Configuration
 APP_AUDIO_BASE = "/home/marks/Development/nu6-phoneme-scorer/audio"
 
 # Constants
-TARGET_DBFS_SPEECH = -24.2
+TARGET_DBFS_SPEECH = APP_SPEECH_DBFS
 SILENCE_THRESHOLD_DB = -50
 
 # Paths to tools
@@ -66,12 +72,23 @@ def trim_silence(src_dest_path):
         print(f"   ERROR trimming {src_dest_path}: {e}")
         if os.path.exists(tmp_path):
             os.remove(tmp_path)
+        return False
+    return True
 
-def process_file(filepath, target_db):
+def process_file(filepath, target_db, manifest=None):
     if not os.path.exists(filepath):
         return
 
+    # Files are rewritten in place, so the manifest tracks the file against
+    # its own last output: unchanged bytes + same params means already done.
+    params = {"target_db": target_db, "silence_threshold": SILENCE_THRESHOLD_DB}
+    if manifest is not None and manifest.is_fresh(filepath, filepath, params):
+        print(f"Up to date: {os.path.basename(filepath)}")
+        return
+
     print(f"Processing: {os.path.basename(filepath)}")
+    # Lets prepare_assets recognise the result as built from its output
+    replaced = file_digest(filepath)
     
     # 1. Normalize (overwrite in place effectively, as src==dest usage in other script implies distinct src/dest, 
     # but here we want to update the file. ffmpeg-normalize supports overwrite if -o is same?)
@@ -86,14 +103,23 @@ def process_file(filepath, target_db):
         return
 
     # 2. Trim (modifies tmp_norm in place)
-    trim_silence(tmp_norm)
+    if not trim_silence(tmp_norm):
+        os.remove(tmp_norm)
+        return
     
     # 3. Replace original
     shutil.move(tmp_norm, filepath)
     print(f"   -> Done")
 
+    if manifest is not None:
+        manifest.record(filepath, filepath, params, replaced=replaced)
+
 
 def main():
+    parser = argparse.ArgumentParser(description="Re-normalize HF3/HF4 in place.")
+    parser.add_argument("--force", action="store_true", help="Ignore the build manifest and reprocess every file")
+    args = parser.parse_args()
+
     # Verify tools
     if not os.path.exists(FFMPEG_NORMALIZE_BIN):
         print(f"ERROR: ffmpeg-normalize not found at {FFMPEG_NORMALIZE_BIN}")
@@ -101,6 +127,9 @@ def main():
         sys.exit(1)
 
     folders_to_process = ["HF3", "HF4"]
+    manifest = BuildManifest(APP_AUDIO_BASE, "normalize_hf3_hf4")
+    if args.force:
+        manifest.entries.clear()
     
     for folder in folders_to_process:
         dir_path = os.path.join(APP_AUDIO_BASE, folder)
@@ -113,7 +142,9 @@ def main():
         
         for filename in files:
             filepath = os.path.join(dir_path, filename)
-            process_file(filepath, TARGET_DBFS_SPEECH)
+            process_file(filepath, TARGET_DBFS_SPEECH, manifest)
+
+    manifest.save()
 
 if __name__ == "__main__":
     main()
@@ -1,81 +1,94 @@
 import os
+import sys
 import glob
 import numpy as np
-import scipy.io.wavfile as wav
 import matplotlib.pyplot as plt
-from scipy.signal import welch
 
+# Shared helpers live in audio_tools/ at the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from audio_tools.psd_cache import PSDCache
+from audio_tools.psd import corpus_psd
+from audio_tools.segment import target_word_bounds
+from audio_tools.boundaries import BoundaryIndex, INDEX_NAME
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DIR_3A = "audio/3A"
 DIR_3D = "Rose_Hill_Clinical_WAVs_List_3D"
+PSD_CACHE_DIR = os.path.join(PROJECT_DIR, ".cache", "psd")
+WELCH_NPERSEG = 2048
+BOUNDARY_INDEX_PATH = os.path.join(PROJECT_DIR, "audio", INDEX_NAME)
+
+# Carrier-phrase separation: 50 ms envelope, 10% of max, >100 ms segments
+TARGET_WORD_PARAMS = {"env_window": 0.05, "rel_thresh": 0.1, "min_len": 0.1, "padding": 0.05}
+
+# Quiet gating before Welch: keep samples above 1% of the peak, drop
+# files left with fewer than 1024 samples
+GATE_PARAMS = {"rel_thresh": 0.01, "min_samples": 1024}
+
+# Everything each preprocess depends on; part of the PSD cache key
+PREP_FULL_PARAMS = {"gate": GATE_PARAMS}
+PREP_WORD_PARAMS = {"gate": GATE_PARAMS, "target_word": TARGET_WORD_PARAMS}
 
 OCTAVE_TICKS = [125, 250, 500, 1000, 2000, 4000, 8000]
 OCTAVE_LABELS = ['125', '250', '500', '1k', '2k', '4k', '8k']
 
-def read_wav(path):
-    sr, data = wav.read(path)
-    if data.dtype == np.int16: data = data / 32768.0
-    elif data.dtype == np.int32: data = data / 2147483648.0
-    elif data.dtype == np.uint8: data = (data - 128) / 128.0
-    if len(data.shape) > 1: data = np.mean(data, axis=1)
-    return sr, data.astype(np.float32)
-
 def isolate_target_word(data, sr):
-    window = int(0.05 * sr)
-    abs_data = np.abs(data)
-    env = np.convolve(abs_data, np.ones(window)/window, mode='same')
-    thresh = 0.1 * np.max(env)
-    is_speech = env > thresh
-    
-    edges = np.diff(is_speech.astype(int))
-    starts = np.where(edges == 1)[0]
-    ends = np.where(edges == -1)[0]
-    
-    if is_speech[0]: starts = np.insert(starts, 0, 0)
-    if is_speech[-1]: ends = np.append(ends, len(is_speech)-1)
-    
-    min_len = int(0.1 * sr)
-    valid_starts, valid_ends = [], []
-    for s, e in zip(starts, ends):
-        if e - s > min_len:
-            valid_starts.append(s)
-            valid_ends.append(e)
-            
-    if len(valid_starts) > 1:
-        word_start = valid_starts[-1]
-        word_end = valid_ends[-1]
-        word_start = max(0, word_start - int(0.05*sr))
-        word_end = min(len(data), word_end + int(0.05*sr))
-        return data[word_start:word_end]
-    else:
-        return data[len(data)//2:]
-
-def get_mean_psd(file_list, remove_carrier=False, as_db=False):
-    all_psds = []
-    freqs = None
-    
-    for f in file_list:
-        sr, data = read_wav(f)
-        if remove_carrier:
-             data = isolate_target_word(data, sr)
-             
-        rms = np.std(data)
-        if rms > 0:
-            data = data[np.abs(data) > 0.01 * np.max(np.abs(data))]
-            
-        if len(data) < 1024: continue
-        
-        f_arr, pxx = welch(data, sr, nperseg=2048)
-        if freqs is None:
-            freqs = f_arr
-        all_psds.append(pxx)
-        
-    if not all_psds:
-        return freqs, None
-        
-    mean_psd = np.mean(all_psds, axis=0)
+    start, end = target_word_bounds(data, sr, **TARGET_WORD_PARAMS)
+    return data[start:end]
+
+def index_target_words(file_list, index):
+    """
+    Records the target-word bounds of each file in the boundary index,
+    computing only those not already there (in parallel).
+    """
+    index.build(file_list, [("target_word", TARGET_WORD_PARAMS)])
+
+def gate_quiet(data, rel_thresh=GATE_PARAMS["rel_thresh"], min_samples=GATE_PARAMS["min_samples"]):
+    rms = np.std(data)
+    if rms > 0:
+        data = data[np.abs(data) > rel_thresh * np.max(np.abs(data))]
+    if len(data) < min_samples:
+        return None
+    return data
+
+# Loaded lazily, once per (worker) process
+_boundary_index = None
+
+def boundary_index():
+    global _boundary_index
+    if _boundary_index is None:
+        _boundary_index = BoundaryIndex(BOUNDARY_INDEX_PATH)
+    return _boundary_index
+
+# Module-level so corpus_psd can ship them to worker processes
+def prep_full(data, sr, path):
+    return gate_quiet(data)
+
+def prep_word(data, sr, path):
+    bounds = boundary_index().lookup(path, "target_word", TARGET_WORD_PARAMS)
+    if bounds is None:
+        return gate_quiet(isolate_target_word(data, sr))
+    return gate_quiet(data[bounds[0]:bounds[1]])
+
+def to_db(psd):
+    return 10 * np.log10(psd + 1e-12)
+
+def get_mean_psd(file_list, remove_carrier=False, as_db=False, cache=None):
+    if not file_list:
+        return None, None
+
+    result = corpus_psd(
+        file_list, nperseg=WELCH_NPERSEG,
+        preprocess=prep_word if remove_carrier else prep_full,
+        preprocess_params=PREP_WORD_PARAMS if remove_carrier else PREP_FULL_PARAMS,
+        cache=cache
+    )
+    mean_psd = result["mean"]
+    if mean_psd is None:
+        return result["freqs"], None
     if as_db:
-        return freqs, 10 * np.log10(mean_psd + 1e-12)
-    return freqs, mean_psd
+        return result["freqs"], to_db(mean_psd)
+    return result["freqs"], mean_psd
 
 def smooth(y, box_pts):
     box = np.ones(box_pts)/box_pts
@@ -124,30 +137,30 @@ def make_plot(f_3a_full, p_3a_full, f_3d, p_3d, f_3a_word, p_3a_word, f_3d_word,
 def main():
     files_3a = glob.glob(os.path.join(DIR_3A, "*.wav"))
     files_3d = glob.glob(os.path.join(DIR_3D, "*.wav"))
+    cache = PSDCache(PSD_CACHE_DIR)
+
+    # Target-word bounds are saved so other tools can reuse them
+    index_target_words(files_3a, boundary_index())
     
     print(f"Generating Logistic (dB) and Linear plots...")
     
-    # Generate DB data
-    f_3a_f_db, p_3a_f_db = get_mean_psd(files_3a, remove_carrier=False, as_db=True)
-    f_3d_db, p_3d_db = get_mean_psd(files_3d, remove_carrier=False, as_db=True)
-    f_3a_w_db, p_3a_w_db = get_mean_psd(files_3a, remove_carrier=True, as_db=True)
-    f_3d_w_db, p_3d_w_db = get_mean_psd(files_3d, remove_carrier=False, as_db=True)
+    # One linear mean per distinct spectrum; the 3D list has no carrier
+    # phrase, so its "full" and "word" spectra are the same curve.
+    # dB versions are derived from these rather than recomputed.
+    f_3a_f, p_3a_f = get_mean_psd(files_3a, remove_carrier=False, cache=cache)
+    f_3a_w, p_3a_w = get_mean_psd(files_3a, remove_carrier=True, cache=cache)
+    f_3d, p_3d = get_mean_psd(files_3d, remove_carrier=False, cache=cache)
+    cache.prune()
     
-    make_plot(f_3a_f_db, smooth(p_3a_f_db, 15), 
-              f_3d_db, smooth(p_3d_db, 15), 
-              f_3a_w_db, smooth(p_3a_w_db, 15), 
-              f_3d_w_db, smooth(p_3d_w_db, 15), is_db=True)
+    make_plot(f_3a_f, smooth(to_db(p_3a_f), 15), 
+              f_3d, smooth(to_db(p_3d), 15), 
+              f_3a_w, smooth(to_db(p_3a_w), 15), 
+              f_3d, smooth(to_db(p_3d), 15), is_db=True)
               
-    # Generate Linear data
-    f_3a_f_lin, p_3a_f_lin = get_mean_psd(files_3a, remove_carrier=False, as_db=False)
-    f_3d_lin, p_3d_lin = get_mean_psd(files_3d, remove_carrier=False, as_db=False)
-    f_3a_w_lin, p_3a_w_lin = get_mean_psd(files_3a, remove_carrier=True, as_db=False)
-    f_3d_w_lin, p_3d_w_lin = get_mean_psd(files_3d, remove_carrier=False, as_db=False)
-    
-    make_plot(f_3a_f_lin, smooth(p_3a_f_lin, 15), 
-              f_3d_lin, smooth(p_3d_lin, 15), 
-              f_3a_w_lin, smooth(p_3a_w_lin, 15), 
-              f_3d_w_lin, smooth(p_3d_w_lin, 15), is_db=False)
+    make_plot(f_3a_f, smooth(p_3a_f, 15), 
+              f_3d, smooth(p_3d, 15), 
+              f_3a_w, smooth(p_3a_w, 15), 
+              f_3d, smooth(p_3d, 15), is_db=False)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,250 @@
+import os
+import sys
+import csv
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+# Shared helpers live in audio_tools/ at the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from audio_tools.wavio import read_pcm, to_float32, write_pcm, sample_width
+from audio_tools.segment import silence_runs, voice_segments, slice_padded
+from audio_tools.boundaries import BoundaryIndex, INDEX_NAME
+
+# Configuration
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_DIR = os.path.join(BASE_DIR, "audio", "NU-6")
+HALF_NAMES = {1: "first half", 2: "second half"}
+WORDS_PER_HALF = 25
+
+# Words per NU-6 half-list, in recording order
+HALF_LISTS = {
+    ("1A", 1): [
+        "LAUD", "BOAT", "POOL", "NAG", "LIMB",
+        "SHOUT", "SUB", "VINE", "DIME", "GOOSE",
+        "WHIP", "TOUGH", "PUFF", "KEEN", "DEATH",
+        "SELL", "TAKE", "FALL", "RAISE", "THIRD",
+        "GAP", "FAT", "MET", "JAR", "DOOR"
+    ],
+    ("1A", 2): [
+        "LOVE", "SURE", "KNOCK", "CHOICE", "HASH",
+        "LOT", "RAID", "HURL", "MOON", "PAGE",
+        "YES", "REACH", "KING", "HOME", "RAG",
+        "WHICH", "WEEK", "SIZE", "MODE", "BEAN",
+        "TIP", "CHALK", "JAIL", "BURN", "KITE"
+    ],
+    ("2A", 1): [
+        "PICK", "ROOM", "NICE", "SAID", "FAIL",
+        "SOUTH", "WHITE", "KEEP", "DEAD", "LOAF",
+        "DAB", "NUMB", "JUICE", "CHIEF", "MERGE",
+        "WAG", "RAIN", "WITCH", "SOAP", "YOUNG",
+        "TON", "KEG", "CALM", "TOOL", "PIKE"
+    ],
+    ("2A", 2): [
+        "MILL", "HUSH", "SHACK", "READ", "ROT",
+        "HATE", "LIVE", "BOOK", "VOICE", "GAZE",
+        "PAD", "THOUGHT", "BOUGHT", "TURN", "CHAIR",
+        "LORE", "BITE", "HAZE", "MATCH", "LEARN",
+        "SHAWL", "DEEP", "GIN", "GOAL", "FAR"
+    ],
+    ("3A", 1): [
+        "BASE", "MESS", "CAUSE", "MOP", "GOOD",
+        "LUCK", "WALK", "YOUTH", "PAIN", "DATE",
+        "PEARL", "SEARCH", "DITCH", "TALK", "RING",
+        "GERM", "LIFE", "TEAM", "LID", "POLE",
+        "RODE", "SHALL", "LATE", "CHEEK", "BEG"
+    ],
+    ("3A", 2): [
+        "GUN", "JUG", "SHEEP", "FIVE", "RUSH",
+        "RAT", "VOID", "WIRE", "HALF", "NOTE",
+        "WHEN", "NAME", "THIN", "TELL", "BAR",
+        "MOUSE", "HIRE", "CAB", "HIT", "CHAT",
+        "PHONE", "SOUP", "DODGE", "SEIZE", "COOL"
+    ],
+    ("4A", 1): [
+        "PASS", "DOLL", "BACK", "RED", "WASH",
+        "SOUR", "BONE", "GET", "WHEAT", "THUMB",
+        "SALE", "YEARN", "WIFE", "SUCH", "NEAT",
+        "PEG", "MOB", "GAS", "CHECK", "JOIN",
+        "LEASE", "LONG", "CHAIN", "KILL", "HOLE"
+    ],
+    ("4A", 2): [
+        "LEAN", "TAPE", "TIRE", "DIP", "ROSE",
+        "CAME", "FIT", "MAKE", "VOTE", "JUDGE",
+        "FOOD", "RIPE", "HAVE", "ROUGH", "KICK",
+        "LOSE", "NEAR", "PERCH", "SHIRT", "BATH",
+        "TIME", "HALL", "MOOD", "DOG", "SHOULD"
+    ],
+}
+
+# Silence detection parameters
+SILENCE_THRESH_DB = -50.0
+MIN_SILENCE_DURATION = 0.5 # seconds
+PADDING = 0.2 # seconds padding around words
+# List 1A was cut with a little more room around each word
+PADDING_OVERRIDES = {"1A": 0.25}
+
+BOUNDARY_INDEX_PATH = os.path.join(BASE_DIR, "audio", INDEX_NAME)
+SILENCE_PARAMS = {"noise_db": SILENCE_THRESH_DB, "min_silence": MIN_SILENCE_DURATION}
+
+# Loaded lazily, once per (worker) process
+_boundary_index = None
+
+def boundary_index():
+    global _boundary_index
+    if _boundary_index is None:
+        _boundary_index = BoundaryIndex(BOUNDARY_INDEX_PATH)
+    return _boundary_index
+
+def load_words(list_id, half):
+    """
+    Words for one half-list. A NU6_List_<list>.csv (Number,Word) in the
+    project root takes precedence over the built-in table.
+    """
+    csv_path = os.path.join(BASE_DIR, f"NU6_List_{list_id}.csv")
+    if not os.path.exists(csv_path):
+        return HALF_LISTS[(list_id, half)]
+
+    first = 1 + (half - 1) * WORDS_PER_HALF
+    with open(csv_path, newline="") as f:
+        rows = sorted((int(r["Number"]), r["Word"].strip().upper()) for r in csv.DictReader(f))
+    return [word for number, word in rows if first <= number < first + WORDS_PER_HALF]
+
+def source_file(list_id, half):
+    return os.path.join(SOURCE_DIR, f"NU No. 6 CNC List {list_id} ({HALF_NAMES[half]}).wav")
+
+def split_half_list(list_id, half, words=None, output_dir=None):
+    """
+    Decodes one half-list recording once, finds the word segments on the
+    decoded buffer and writes every word straight from that buffer.
+
+    Returns a dict describing the run (segment count, files written).
+    """
+    words = words or load_words(list_id, half)
+    input_file = source_file(list_id, half)
+    output_dir = output_dir or os.path.join(BASE_DIR, "audio", list_id)
+    start_index = 1 + (half - 1) * WORDS_PER_HALF
+    padding = PADDING_OVERRIDES.get(list_id, PADDING)
+
+    result = {
+        "list": list_id,
+        "half": half,
+        "input": input_file,
+        "expected": len(words),
+        "segments": 0,
+        "written": [],
+    }
+    if not os.path.exists(input_file):
+        result["error"] = f"Input file not found: {input_file}"
+        return result
+
+    # Segments are found on the float view; words are cut from the
+    # original PCM so the written samples are bit-identical to the source
+    # Silence runs come from the boundary index when main() has built it
+    sr, raw = read_pcm(input_file)
+    width = sample_width(input_file) # 24-bit sources read as int32; write them back as 24-bit
+    runs = boundary_index().lookup(input_file, "silences", SILENCE_PARAMS)
+    if runs is None:
+        runs = silence_runs(to_float32(raw), sr, **SILENCE_PARAMS)
+    silences = [(s / sr, e / sr) for s, e in runs]
+    segments = voice_segments(silences)
+    result["segments"] = len(segments)
+
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    for i, (start, end) in enumerate(segments[:len(words)]):
+        word = words[i]
+        title_word = word[0].upper() + word[1:].lower()
+        filename = f"{start_index + i:02d}_{title_word}.wav"
+
+        clip, s, e = slice_padded(raw, sr, start, end, padding)
+        write_pcm(os.path.join(output_dir, filename), sr, clip, width)
+        result["written"].append({"file": filename, "start": round(s, 3), "end": round(e, 3)})
+
+    result["skipped"] = [(round(s, 3), round(e, 3)) for s, e in segments[len(words):]]
+    return result
+
+def print_result(result):
+    if "error" in result:
+        print(f"Error: {result['error']}")
+        return
+    print(f"Input: {result['input']}")
+    print(f"Found {result['segments']} segments.")
+    if result["segments"] != result["expected"]:
+        print(f"WARNING: Expected {result['expected']} segments, found {result['segments']}.")
+    for w in result["written"]:
+        print(f"  Extracted: {w['file']} ({w['start']:.2f}-{w['end']:.2f})")
+    for i, (s, e) in enumerate(result["skipped"]):
+        print(f"Skipping extra segment {result['expected'] + i + 1}: {s}-{e}")
+
+def _split_job(key):
+    return split_half_list(*key)
+
+def split_all(n_jobs=None):
+    """
+    Splits every half-list in HALF_LISTS on a process pool.
+    Results come back in HALF_LISTS order.
+    """
+    keys = sorted(HALF_LISTS)
+    with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+        return list(pool.map(_split_job, keys))
+
+def build_report(results):
+    halves = []
+    for r in results:
+        entry = {
+            "list": r["list"],
+            "half": r["half"],
+            "input": os.path.relpath(r["input"], BASE_DIR),
+            "expected": r["expected"],
+            "segments": r["segments"],
+            "written": len(r["written"]),
+            "ok": "error" not in r and r["segments"] == r["expected"],
+        }
+        if "error" in r:
+            entry["error"] = r["error"]
+        halves.append(entry)
+    return {"ok": all(h["ok"] for h in halves), "halves": halves}
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Split NU-6 half-list recordings into word files.")
+    parser.add_argument("list_id", nargs="?", choices=sorted({k[0] for k in HALF_LISTS}), help="NU-6 list, e.g. 3A")
+    parser.add_argument("half", nargs="?", type=int, choices=[1, 2], help="1 = words 1-25, 2 = words 26-50")
+    parser.add_argument("--all", action="store_true", help="Split all eight half-lists in parallel")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes for --all (default: one per core)")
+    parser.add_argument("--report", help="Write a JSON report of segment counts to this path")
+    args = parser.parse_args()
+    if not args.all and (args.list_id is None or args.half is None):
+        parser.error("give a list and half (e.g. 3A 1) or --all")
+    return args
+
+def main():
+    args = parse_args()
+    keys = sorted(HALF_LISTS) if args.all else [(args.list_id, args.half)]
+
+    # Scan (or reuse) the silence runs of every source before splitting
+    sources = [source_file(*key) for key in keys if os.path.exists(source_file(*key))]
+    boundary_index().build(sources, [("silences", SILENCE_PARAMS)], args.jobs)
+
+    if args.all:
+        results = split_all(args.jobs)
+    else:
+        results = [split_half_list(args.list_id, args.half)]
+
+    for result in results:
+        if args.all:
+            print(f"\n--- {result['list']} ({HALF_NAMES[result['half']]}) ---")
+        print_result(result)
+
+    report = build_report(results)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.report}")
+    print("Done.")
+    if args.all and not report["ok"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()